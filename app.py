@@ -1,25 +1,85 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash, send_file
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash, Response, send_file
 from models import User, Request, RequestLog
-from report_exporters import PDFExporter, ExcelExporter
+from report_exporters import PDF_EXPORTER, EXCEL_EXPORTER
+from flask.json.provider import JSONProvider
+from flask_caching import Cache
+from flask_compress import Compress
 from functools import wraps
-from datetime import datetime
+from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import orjson
 import os
+import tempfile
+import time
+import uuid
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, which serializes large list-of-dict
+    payloads several times faster than the stdlib json module"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-this-in-production')
+app.json = OrjsonProvider(app)
+
+# Server-side sessions: when SESSION_REDIS_URL is set, session data lives
+# in Redis and the cookie shrinks to a session id, replacing the per-request
+# HMAC verify + JSON decode of the client-side cookie with a single GET.
+# Without the env var the default signed cookie is used.
+_session_redis_url = os.environ.get('SESSION_REDIS_URL')
+if _session_redis_url:
+    import redis
+    from flask_session import Session
+    app.config['SESSION_TYPE'] = 'redis'
+    app.config['SESSION_REDIS'] = redis.from_url(_session_redis_url)
+    Session(app)
+
+# In-process response cache for endpoints the SPA polls repeatedly
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
+
+# Compress JSON and Excel responses; report payloads are highly repetitive
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_MIMETYPES'] = [
+    'text/html', 'text/css', 'text/javascript', 'application/javascript',
+    'application/json',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+]
+Compress(app)
+
+# When fronted by nginx/apache, set USE_X_SENDFILE=1 so send_file responses
+# (the disk-cached exports) return an X-Sendfile header and the proxy
+# zero-copies the file to the socket instead of Python pumping the bytes.
+# Requires the proxy to be configured to honour X-Sendfile/X-Accel-Redirect.
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
 
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if 'user_id' not in session:
-            return redirect(url_for('login'))
+            # _LOGIN_URL is resolved once after route registration (see
+            # bottom of module) to skip the url_for map traversal per miss
+            return redirect(_LOGIN_URL)
         return f(*args, **kwargs)
     return decorated_function
 
 def get_current_user():
+    # id, username and full_name are stored in the session at login, so
+    # callers get them without a DB round-trip per request
     if 'user_id' not in session:
         return None
-    return User.get_by_id(session['user_id'])
+    return {
+        'id': session['user_id'],
+        'username': session['username'],
+        'full_name': session['full_name']
+    }
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -68,13 +128,30 @@ def reports():
 
 # API Routes
 @app.route('/api/requests', methods=['GET'])
+@login_required
 def get_requests():
     # Get query parameters for filtering
     date_from = request.args.get('date_from')
     date_to = request.args.get('date_to')
     overdue_only = request.args.get('overdue_only') == 'true'
-    
-    return jsonify(Request.get_all(date_from=date_from, date_to=date_to, overdue_only=overdue_only))
+
+    # Pagination, capped so a single call can't pull an unbounded result
+    # set through the DB and JSON encoder; negative values would reach
+    # SQLite as LIMIT -1 (no limit), so they are rejected too
+    try:
+        limit = int(request.args.get('limit', 500))
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    if limit < 0 or offset < 0:
+        return jsonify({'error': 'limit and offset must be non-negative'}), 400
+    limit = min(limit, 500)
+
+    # Serialize straight to bytes to skip the decode/encode round-trip on
+    # the largest payload in the app
+    data = Request.get_all(date_from=date_from, date_to=date_to, overdue_only=overdue_only,
+                           limit=limit, offset=offset)
+    return Response(orjson.dumps(data), mimetype='application/json')
 
 @app.route('/api/requests', methods=['POST'])
 @login_required
@@ -128,206 +205,326 @@ def get_request_logs(request_id):
 
 @app.route('/api/users', methods=['GET'])
 @login_required
+@cache.cached(timeout=300, key_prefix='users_filtered')
 def get_users():
     all_users = User.get_all()
     # Filter out Mahmud from team member selection
     filtered_users = [user for user in all_users if user['full_name'].lower() != 'mahmud']
     return jsonify(filtered_users)
 
+# The service-type list is constant for the process lifetime, so its JSON
+# body and ETag are computed once at import and jsonify is bypassed
+_SERVICE_TYPES_BODY = orjson.dumps(Request.SERVICE_TYPES)
+_SERVICE_TYPES_ETAG = hashlib.blake2b(_SERVICE_TYPES_BODY, digest_size=8).hexdigest()
+
 @app.route('/api/service-types', methods=['GET'])
 @login_required
 def get_service_types():
-    return jsonify(Request.SERVICE_TYPES)
+    resp = Response(_SERVICE_TYPES_BODY, mimetype='application/json')
+    resp.set_etag(_SERVICE_TYPES_ETAG)
+    resp.cache_control.max_age = 86400
+    return resp.make_conditional(request)
 
 @app.route('/api/dashboard/stats', methods=['GET'])
 @login_required
+@cache.cached(timeout=30, query_string=True)
 def get_dashboard_stats():
     return jsonify(Request.get_stats())
 
-@app.route('/api/reports/daily', methods=['GET'])
-@login_required
-def get_daily_report():
-    target_date = request.args.get('date')
-    if not target_date:
-        from datetime import date
-        target_date = date.today().strftime('%Y-%m-%d')
-    
-    try:
-        data = Request.get_daily_report(target_date)
-        return jsonify(data)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+def report_response(data):
+    """Build a report response with ETag/Last-Modified so unchanged reports
+    short-circuit to a 304 instead of resending the full payload"""
+    resp = jsonify(data)
+    resp.set_etag(hashlib.blake2b(orjson.dumps(data), digest_size=16).hexdigest())
+    mtime = Request.get_report_mtime()
+    if mtime:
+        resp.last_modified = datetime.fromisoformat(mtime)
+    return resp.make_conditional(request)
 
-@app.route('/api/reports/weekly', methods=['GET'])
-@login_required
-def get_weekly_report():
-    week_str = request.args.get('week')
-    if not week_str:
-        from datetime import date
-        today = date.today()
-        year = today.year
-        week = today.isocalendar()[1]
-    else:
-        # Parse format like "2024-W52"
-        year, week_part = week_str.split('-W')
-        year = int(year)
-        week = int(week_part)
-    
-    try:
-        data = Request.get_weekly_report(year, week)
-        return jsonify(data)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+# Report and export routes for the three period kinds share identical
+# structure, so they are generated from one pair of handler factories.
 
-@app.route('/api/reports/monthly', methods=['GET'])
-@login_required
-def get_monthly_report():
-    month_str = request.args.get('month')
+# Single dispatch table for export formats: one dict lookup replaces the
+# lower()/branch chain in every handler, and adding a format is a
+# one-line edit
+_EXPORT_FORMATS = {
+    'pdf': (PDF_EXPORTER.create_report_pdf, 'pdf', 'application/pdf'),
+    'excel': (EXCEL_EXPORTER.create_report_excel, 'xlsx',
+              'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+}
+
+# Rendered export files are cached on disk keyed by content hash, so
+# repeat exports of an unchanged period are pure sendfile transfers
+_EXPORT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'gbb_export_cache')
+os.makedirs(_EXPORT_CACHE_DIR, exist_ok=True)
+
+# Month names for export labels; avoids a datetime allocation and a
+# locale-aware strftime call per export
+_MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June',
+                'July', 'August', 'September', 'October', 'November', 'December')
+
+def _parse_period(kind, args):
+    """Parse the period query params for a report kind.
+
+    Returns (period_label, report_args, filename_suffix).
+    """
+    if kind == 'daily':
+        target_date = args.get('date') or date.today().strftime('%Y-%m-%d')
+        return f'Daily Report - {target_date}', (target_date,), target_date
+
+    if kind == 'weekly':
+        week_str = args.get('week')
+        if not week_str:
+            today = date.today()
+            year = today.year
+            week = today.isocalendar()[1]
+        else:
+            # Parse format like "2024-W52"
+            year_part, week_part = week_str.split('-W')
+            year = int(year_part)
+            week = int(week_part)
+        return f'Weekly Report - Week {week}, {year}', (year, week), f'{year}_W{week:02d}'
+
+    # monthly
+    month_str = args.get('month')
     if not month_str:
-        from datetime import date
         today = date.today()
         year = today.year
         month = today.month
     else:
         # Parse format like "2024-12"
-        year, month = month_str.split('-')
-        year = int(year)
-        month = int(month)
-    
-    try:
-        data = Request.get_monthly_report(year, month)
-        return jsonify(data)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        year_part, month_part = month_str.split('-')
+        year = int(year_part)
+        month = int(month_part)
+        # Out-of-range months would raise IndexError below, which the
+        # handlers don't map to a JSON error the way they do ValueError
+        if not 1 <= month <= 12:
+            raise ValueError(f'month must be 1-12, got {month}')
+    return f'Monthly Report - {_MONTH_NAMES[month - 1]} {year}', (year, month), f'{year}_{month:02d}'
 
-# Export endpoints
-@app.route('/api/reports/daily/export/<format_type>', methods=['GET'])
-@login_required
-def export_daily_report(format_type):
-    """Export daily report as PDF or Excel"""
-    target_date = request.args.get('date')
-    if not target_date:
-        from datetime import date
-        target_date = date.today().strftime('%Y-%m-%d')
-    
-    try:
-        # Get report data
-        data = Request.get_daily_report(target_date)
-        period = f"Daily Report - {target_date}"
-        
-        if format_type.lower() == 'pdf':
-            exporter = PDFExporter()
-            buffer = exporter.create_report_pdf(data, 'daily', period)
-            return send_file(
-                buffer,
-                as_attachment=True,
-                download_name=f'daily_report_{target_date}.pdf',
-                mimetype='application/pdf'
-            )
-        elif format_type.lower() == 'excel':
-            exporter = ExcelExporter()
-            buffer = exporter.create_report_excel(data, 'daily', period)
-            return send_file(
-                buffer,
+def _period_is_past(kind, report_args):
+    """True when the period ended before today, so its data is frozen.
+
+    Only such exports may carry a long browser-cache TTL; the current
+    period changes intraday and must revalidate on every request.
+    """
+    today = date.today()
+    if kind == 'daily':
+        try:
+            return date.fromisoformat(report_args[0][:10]) < today
+        except ValueError:
+            return False
+    if kind == 'weekly':
+        iso_year, iso_week, _ = today.isocalendar()
+        return tuple(report_args) < (iso_year, iso_week)
+    return tuple(report_args) < (today.year, today.month)
+
+def _make_report_handler(kind):
+    """Build the JSON report handler for a period kind"""
+    get_report = getattr(Request, f'get_{kind}_report')
+
+    @login_required
+    def handler():
+        try:
+            _, report_args, _ = _parse_period(kind, request.args)
+        except ValueError:
+            return jsonify({'error': 'Invalid period parameter'}), 400
+        try:
+            return report_response(get_report(*report_args))
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    return handler
+
+def _make_export_handler(kind):
+    """Build the PDF/Excel export handler for a period kind.
+
+    The rendered file is cached under a content-hash filename; when the
+    underlying data has not changed, the handler skips rendering entirely
+    and lets send_file stream the cached copy in-kernel.
+    """
+    get_report = getattr(Request, f'get_{kind}_report')
+
+    @login_required
+    def handler(format_type):
+        try:
+            period, report_args, suffix = _parse_period(kind, request.args)
+        except ValueError:
+            return jsonify({'error': 'Invalid period parameter'}), 400
+        try:
+            try:
+                render, ext, mimetype = _EXPORT_FORMATS[format_type.lower()]
+            except KeyError:
+                return jsonify({'error': 'Invalid format type'}), 400
+
+            data = get_report(*report_args)
+            digest = hashlib.blake2b(orjson.dumps(data), digest_size=8).hexdigest()
+            path = os.path.join(_EXPORT_CACHE_DIR, f'{kind}_{suffix}_{digest}.{ext}')
+
+            if not os.path.exists(path):
+                # A miss means the data changed (or the period is new);
+                # sweep superseded renders before adding another file
+                _prune_exports()
+                tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+                with open(tmp_path, 'wb') as output:
+                    render(data, kind, period, stream=output)
+                os.replace(tmp_path, path)
+
+            response = send_file(
+                path,
                 as_attachment=True,
-                download_name=f'daily_report_{target_date}.xlsx',
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+                download_name=f'{kind}_report_{suffix}.{ext}',
+                mimetype=mimetype,
+                conditional=True,
+                # Past periods are immutable and can sit in the browser
+                # cache for a day; the current one relies on the ETag
+                max_age=86400 if _period_is_past(kind, report_args) else None
             )
-        else:
-            return jsonify({'error': 'Invalid format type'}), 400
-            
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+            # Authenticated content: send_file marks max_age responses
+            # public, which would let shared proxies serve one user's
+            # report to another
+            response.cache_control.public = False
+            response.cache_control.private = True
+            return response
 
-@app.route('/api/reports/weekly/export/<format_type>', methods=['GET'])
-@login_required
-def export_weekly_report(format_type):
-    """Export weekly report as PDF or Excel"""
-    week_str = request.args.get('week')
-    if not week_str:
-        from datetime import date
-        today = date.today()
-        year = today.year
-        week = today.isocalendar()[1]
-    else:
-        # Parse format like "2024-W52"
-        year, week_part = week_str.split('-W')
-        year = int(year)
-        week = int(week_part)
-    
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    return handler
+
+for _kind in ('daily', 'weekly', 'monthly'):
+    app.add_url_rule(f'/api/reports/{_kind}',
+                     endpoint=f'get_{_kind}_report',
+                     view_func=_make_report_handler(_kind))
+    app.add_url_rule(f'/api/reports/{_kind}/export/<format_type>',
+                     endpoint=f'export_{_kind}_report',
+                     view_func=_make_export_handler(_kind))
+
+# Asynchronous export jobs: generation of large reports runs on a small
+# worker pool so web workers are freed immediately. The client POSTs to
+# queue a job, receives a token, and polls until the file is ready.
+_EXPORT_POOL = ThreadPoolExecutor(max_workers=2)
+_EXPORT_DIR = os.path.join(tempfile.gettempdir(), 'gbb_exports')
+os.makedirs(_EXPORT_DIR, exist_ok=True)
+
+# Job files and outputs older than this are deleted on the next queue
+# call; a finished file only needs to outlive the client's polling loop
+# and the download that follows
+_EXPORT_TTL = 3600
+
+# Content-hash render cache entries keep their name only while the data
+# is unchanged, so day-old digests are never reused and can be dropped
+_EXPORT_CACHE_TTL = 86400
+
+def _job_path(token):
+    return os.path.join(_EXPORT_DIR, f'{token}.json')
+
+def _write_job(token, job):
+    """Persist job status beside the output file.
+
+    Status lives on the filesystem instead of a process-local dict
+    because gunicorn runs several workers: the worker answering the poll
+    is usually not the one that queued the job. The rename makes the
+    update atomic for concurrent readers.
+    """
+    tmp_path = f'{_job_path(token)}.tmp'
+    with open(tmp_path, 'wb') as job_file:
+        job_file.write(orjson.dumps(job))
+    os.replace(tmp_path, _job_path(token))
+
+def _read_job(token):
     try:
-        # Get report data
-        data = Request.get_weekly_report(year, week)
-        period = f"Weekly Report - Week {week}, {year}"
-        
-        if format_type.lower() == 'pdf':
-            exporter = PDFExporter()
-            buffer = exporter.create_report_pdf(data, 'weekly', period)
-            return send_file(
-                buffer,
-                as_attachment=True,
-                download_name=f'weekly_report_{year}_W{week:02d}.pdf',
-                mimetype='application/pdf'
-            )
-        elif format_type.lower() == 'excel':
-            exporter = ExcelExporter()
-            buffer = exporter.create_report_excel(data, 'weekly', period)
-            return send_file(
-                buffer,
-                as_attachment=True,
-                download_name=f'weekly_report_{year}_W{week:02d}.xlsx',
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-        else:
-            return jsonify({'error': 'Invalid format type'}), 400
-            
+        with open(_job_path(token), 'rb') as job_file:
+            return orjson.loads(job_file.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+def _prune_export_dir(directory, ttl):
+    """Delete files in an export directory older than ttl seconds"""
+    cutoff = time.time() - ttl
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass  # already removed by a concurrent worker
+
+def _prune_exports():
+    """Sweep both the async job directory and the render cache"""
+    _prune_export_dir(_EXPORT_DIR, _EXPORT_TTL)
+    _prune_export_dir(_EXPORT_CACHE_DIR, _EXPORT_CACHE_TTL)
+
+def _run_export_job(token, kind, format_type, period, report_args, suffix):
+    """Generate an export file on the worker pool and record its status"""
+    job = _read_job(token) or {}
+    try:
+        data = getattr(Request, f'get_{kind}_report')(*report_args)
+        render, ext, _ = _EXPORT_FORMATS[format_type]
+        path = os.path.join(_EXPORT_DIR, f'{token}.{ext}')
+        with open(path, 'wb') as output:
+            render(data, kind, period, stream=output)
+        job['path'] = path
+        job['status'] = 'done'
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        job['error'] = str(e)
+        job['status'] = 'error'
+    _write_job(token, job)
 
-@app.route('/api/reports/monthly/export/<format_type>', methods=['GET'])
+@app.route('/api/reports/<kind>/export', methods=['POST'])
 @login_required
-def export_monthly_report(format_type):
-    """Export monthly report as PDF or Excel"""
-    month_str = request.args.get('month')
-    if not month_str:
-        from datetime import date
-        today = date.today()
-        year = today.year
-        month = today.month
-    else:
-        # Parse format like "2024-12"
-        year, month = month_str.split('-')
-        year = int(year)
-        month = int(month)
-    
+def queue_export(kind):
+    if kind not in ('daily', 'weekly', 'monthly'):
+        return jsonify({'error': 'Invalid report type'}), 404
+
+    format_type = request.args.get('format', 'pdf').lower()
+    if format_type not in _EXPORT_FORMATS:
+        return jsonify({'error': 'Invalid format type'}), 400
+
     try:
-        # Get report data
-        data = Request.get_monthly_report(year, month)
-        period = f"Monthly Report - {datetime(year, month, 1).strftime('%B %Y')}"
-        
-        if format_type.lower() == 'pdf':
-            exporter = PDFExporter()
-            buffer = exporter.create_report_pdf(data, 'monthly', period)
-            return send_file(
-                buffer,
-                as_attachment=True,
-                download_name=f'monthly_report_{year}_{month:02d}.pdf',
-                mimetype='application/pdf'
-            )
-        elif format_type.lower() == 'excel':
-            exporter = ExcelExporter()
-            buffer = exporter.create_report_excel(data, 'monthly', period)
-            return send_file(
-                buffer,
-                as_attachment=True,
-                download_name=f'monthly_report_{year}_{month:02d}.xlsx',
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-        else:
-            return jsonify({'error': 'Invalid format type'}), 400
-            
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        period, report_args, suffix = _parse_period(kind, request.args)
+    except ValueError:
+        return jsonify({'error': 'Invalid period parameter'}), 400
+
+    _prune_exports()
+
+    _, ext, mimetype = _EXPORT_FORMATS[format_type]
+    token = uuid.uuid4().hex
+    _write_job(token, {
+        'status': 'pending',
+        'download_name': f'{kind}_report_{suffix}.{ext}',
+        'mimetype': mimetype
+    })
+    _EXPORT_POOL.submit(_run_export_job, token, kind, format_type, period, report_args, suffix)
+
+    return jsonify({'token': token, 'status_url': f'/api/reports/export/{token}'}), 202
+
+@app.route('/api/reports/export/<token>', methods=['GET'])
+@login_required
+def fetch_export(token):
+    # Tokens are uuid4 hex; anything else (e.g. path tricks) is unknown
+    job = _read_job(token) if token.isalnum() else None
+    if not job:
+        return jsonify({'error': 'Unknown export token'}), 404
+
+    if job['status'] == 'error':
+        return jsonify({'error': job['error']}), 500
+    if job['status'] != 'done':
+        return jsonify({'status': job['status']}), 202
+
+    return send_file(
+        job['path'],
+        as_attachment=True,
+        download_name=job['download_name'],
+        mimetype=job['mimetype'],
+        conditional=True
+    )
+
+# Resolve the login redirect target once now that all routes are registered
+with app.test_request_context():
+    _LOGIN_URL = url_for('login')
 
 if __name__ == '__main__':
+    # Development server only - production runs via wsgi.py under
+    # gunicorn's gevent worker
     app.run(debug=True)
\ No newline at end of file
@@ -3,71 +3,158 @@ Database models for the Sales Request Management System
 """
 import sqlite3
 import hashlib
+import hmac
+import os
+import queue
 import random
 import string
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
+from functools import lru_cache
 from typing import Optional, Dict, List
 
 DATABASE_PATH = 'requests.db'
 
+POOL_SIZE = 5
+
+PBKDF2_ITERATIONS = 600_000
+
 def simple_hash(password: str) -> str:
-    """Simple password hashing using SHA256"""
+    """Legacy unsalted SHA256 hash, kept only to verify pre-KDF accounts"""
     return hashlib.sha256(password.encode()).hexdigest()
 
+def hash_password(password: str) -> str:
+    """Hash a password with salted PBKDF2-HMAC-SHA256.
+
+    A single unsalted SHA256 is computable at GPU speed, so new hashes use
+    a per-user salt and a tunable iteration count. The encoded string
+    carries its own parameters: pbkdf2_sha256$iterations$salt$hash.
+    """
+    salt = os.urandom(16)
+    dk = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, PBKDF2_ITERATIONS)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt.hex()}${dk.hex()}"
+
+class _ConnectionPool:
+    """Fixed-size pool of pre-opened SQLite connections.
+
+    Each connection is configured once with WAL journaling and the tuning
+    PRAGMAs, then recycled between callers, so hot endpoints that issue
+    several queries back-to-back stop paying open/attach and PRAGMA-reset
+    costs per call.
+    """
+
+    def __init__(self, path: str, size: int = POOL_SIZE):
+        self._connections = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._connections.put(self._open(path))
+
+    @staticmethod
+    def _open(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers proceed during writes and synchronous=NORMAL
+        # skips the per-commit fsync. Both are safe with several worker
+        # processes on one host (the wsgi.py deployment): WAL coordinates
+        # them through shared-memory locks, and NORMAL only risks losing
+        # the last commits on power failure, never corruption. WAL is
+        # persistent; the other PRAGMAs apply per connection.
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-64000')
+        conn.execute('PRAGMA mmap_size=268435456')
+        # Expose the working-day calculation to SQL so queries can compute
+        # live durations without a Python callback loop per row
+        conn.create_function('wdays', 2, calculate_working_days, deterministic=True)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        return self._connections.get()
+
+    def release(self, conn: sqlite3.Connection):
+        self._connections.put(conn)
+
+@contextmanager
 def get_connection():
-    """Get a database connection with row factory"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Borrow a pooled database connection for the duration of a block.
+
+    Writers enter the connection itself as a second context manager
+    (`with get_connection() as conn, conn:`), which commits on success and
+    rolls back on exception, so method bodies carry no explicit commit()
+    and multi-statement writes land in one transaction (one WAL commit).
+    """
+    conn = _pool.acquire()
+    try:
+        yield conn
+    finally:
+        _pool.release(conn)
+
+def _iter_rows(cursor):
+    """Yield result rows as dicts without materializing a fetchall() list.
+
+    Rows are pulled in sized batches so the sqlite3 C layer fills a buffer
+    per call instead of one Python call per row.
+    """
+    cursor.arraysize = 200
+    while True:
+        batch = cursor.fetchmany()
+        if not batch:
+            return
+        for row in batch:
+            yield dict(row)
+
+# Service type -> custom ID slug, built once at import instead of per call
+_SERVICE_SLUGS = {
+    'Internet Service': 'IS',
+    'Lease line': 'LL',
+    'Dark Fibre': 'DF',
+    'Network Monitoring': 'NM',
+    'Others - Connectivity (Renewal, Upgrade, IT Device, IP Addresses, Consultation, Support etc)': 'OC',
+    'Collocation': 'CS',
+    'Cross Connection': 'CC',
+    'Collocation & Cross-connect Renewal': 'CR',
+    'ECS': 'EC',
+    'Disaster Recovery': 'DR',
+    'Backup Service': 'BS',
+    'Object Storage': 'OS',
+    'Email Service': 'ES',
+    'Others - Cloud (Renewal, Upgrade of Cloud Resources, IP Address, Licenses etc)': 'OR',
+    'Document Management System - EDMS': 'DM',
+    'Capacity Building - Training': 'CB',
+    'Network Security': 'NS',
+    'Security Renewal': 'SR'
+}
 
 def get_service_slug(service_type: str) -> str:
     """Get service slug for custom ID generation"""
-    service_slugs = {
-        'Internet Service': 'IS',
-        'Lease line': 'LL', 
-        'Dark Fibre': 'DF',
-        'Network Monitoring': 'NM',
-        'Others - Connectivity (Renewal, Upgrade, IT Device, IP Addresses, Consultation, Support etc)': 'OC',
-        'Collocation': 'CS',
-        'Cross Connection': 'CC',
-        'Collocation & Cross-connect Renewal': 'CR',
-        'ECS': 'EC',
-        'Disaster Recovery': 'DR',
-        'Backup Service': 'BS',
-        'Object Storage': 'OS',
-        'Email Service': 'ES',
-        'Others - Cloud (Renewal, Upgrade of Cloud Resources, IP Address, Licenses etc)': 'OR',
-        'Document Management System - EDMS': 'DM',
-        'Capacity Building - Training': 'CB',
-        'Network Security': 'NS',
-        'Security Renewal': 'SR'
-    }
-    return service_slugs.get(service_type, 'OT')  # Default to 'OT' for Other
-
-def generate_custom_id(service_type: str = 'Internet Service') -> str:
-    """Generate custom request ID in format GBB_SDA_MMYY_[SERVICE_SLUG]_[SEQUENTIAL_NUMBER]"""
+    return _SERVICE_SLUGS.get(service_type, 'OT')  # Default to 'OT' for Other
+
+def generate_custom_id(cursor, service_type: str = 'Internet Service') -> str:
+    """Generate custom request ID in format GBB_SDA_MMYY_[SERVICE_SLUG]_[SEQUENTIAL_NUMBER]
+
+    Runs on the caller's cursor so the MAX() read and the insert that
+    follows share one write transaction.
+    """
     now = datetime.now()
     mmyy = now.strftime('%m%y')
     service_slug = get_service_slug(service_type)
-    
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Get the next sequential number for this service type and month/year
+
+    # Get the next sequential number for this service type and month/year.
+    # A seekable range with MAX() lets SQLite answer from the UNIQUE index
+    # on custom_id; LIKE is NOCASE by default and would force a full scan.
     prefix = f"GBB_SDA_{mmyy}_{service_slug}_"
-    
+    prefix_end = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
     cursor.execute('''
-        SELECT custom_id FROM requests 
-        WHERE custom_id LIKE ? 
-        ORDER BY custom_id DESC 
-        LIMIT 1
-    ''', (f'{prefix}%',))
-    
+        SELECT MAX(custom_id) as last_id FROM requests
+        WHERE custom_id >= ? AND custom_id < ?
+    ''', (prefix, prefix_end))
+
     result = cursor.fetchone()
-    
-    if result:
+
+    if result and result['last_id']:
         # Extract the sequential number from the last ID
-        last_id = result['custom_id']
+        last_id = result['last_id']
         try:
             last_number = int(last_id.split('_')[-1])
             next_number = last_number + 1
@@ -75,37 +162,69 @@ def generate_custom_id(service_type: str = 'Internet Service') -> str:
             next_number = 1
     else:
         next_number = 1
-    
+
     # Format with 3-digit zero padding
-    custom_id = f"{prefix}{next_number:03d}"
-    
-    conn.close()
-    return custom_id
+    return f"{prefix}{next_number:03d}"
+
+# Working days among the r days following a start whose weekday is s
+_WD_REM = [[sum(1 for i in range(1, r + 1) if (s + i) % 7 < 5) for r in range(8)]
+           for s in range(7)]
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str):
+    """Parse a YYYY-MM-DD string, caching repeated values.
+
+    The same date_request_received strings recur across every get_all row,
+    so caching turns repeat parses into a dict hit. fromisoformat is about
+    10x faster than strptime on a miss; the slice tolerates full timestamps.
+    """
+    return date.fromisoformat(date_str[:10])
+
+def _next_day(date_str: str) -> str:
+    """Exclusive upper bound for a day-granular date range.
+
+    Comparing `col >= start AND col < next_day` matches both plain dates
+    and full timestamps, and unlike wrapping the column in DATE() it keeps
+    the comparison indexable.
+    """
+    return (_parse_date(date_str) + timedelta(days=1)).isoformat()
 
 def calculate_working_days(start_date: str, end_date: Optional[str] = None) -> int:
-    """Calculate working days between two dates (excluding weekends)"""
+    """Calculate working days between two dates (excluding weekends).
+
+    Closed-form: full weeks contribute 5 working days each and the
+    remainder comes from the precomputed weekday table, so the cost is
+    O(1) regardless of how old the request is.
+    """
     if end_date is None:
         end_date = date.today().strftime('%Y-%m-%d')
-    
-    start = datetime.strptime(start_date, '%Y-%m-%d').date()
-    end = datetime.strptime(end_date, '%Y-%m-%d').date()
-    
-    # If start date is same as end date, return 1 (same day duration)
-    if start == end:
+
+    start = _parse_date(start_date)
+    end = _parse_date(end_date)
+
+    # If start date is same as (or after) end date, return 1 (same day duration)
+    if start >= end:
         return 1
-    
-    # Calculate working days excluding weekends
-    working_days = 0
-    current_date = start + timedelta(days=1)  # Start from the day after start date
-    
-    while current_date <= end:
-        # Monday = 0, Sunday = 6. Skip Saturday (5) and Sunday (6)
-        if current_date.weekday() < 5:
-            working_days += 1
-        current_date += timedelta(days=1)
-    
+
+    full_weeks, rem = divmod((end - start).days, 7)
+
     # Add 1 for the start date (partial or full day counts as duration)
-    return working_days + 1
+    return 1 + full_weeks * 5 + _WD_REM[start.weekday()][rem]
+
+# The pool registers wdays() against calculate_working_days, so it must be
+# created after the function is defined
+_pool = _ConnectionPool(DATABASE_PATH)
+
+# Status display priority (lower number = higher priority); built once
+# instead of per get_status_sort_order call. Mirrored by
+# Request.STATUS_ORDER_SQL for queries that sort in SQL.
+_STATUS_ORDER = {
+    'Closed Request': 1,
+    'Pending with Presales': 2,
+    'Pending review': 3,
+    'Pending approval': 4,
+    'in_progress': 5
+}
 
 class Request:
     """Request model"""
@@ -156,625 +275,626 @@ class Request:
     ]
     
     @staticmethod
-    def create_table():
-        """Create the requests table with proper schema"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS requests (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                custom_id TEXT UNIQUE,
-                customer_name TEXT NOT NULL,
-                description TEXT NOT NULL,
-                project_type TEXT NOT NULL,
-                service_type TEXT DEFAULT 'Internet Service',
-                status TEXT NOT NULL DEFAULT 'in_progress',
-                boq_cost DECIMAL(10,2),
-                requester_name TEXT,
-                department TEXT,
-                date_request_received DATE NOT NULL,
-                target_days INTEGER,
-                sent_out_date DATE,
-                duration_days INTEGER DEFAULT 0,
-                team_member_involved TEXT NOT NULL,
-                comment TEXT,
-                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-    
+    def create_table(conn: sqlite3.Connection = None):
+        """Create the requests table with proper schema.
+
+        When `conn` is given the DDL runs on the caller's connection and
+        joins its open transaction (see init_database).
+        """
+        if conn is None:
+            with get_connection() as conn, conn:
+                Request.create_table(conn)
+        else:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS requests (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    custom_id TEXT UNIQUE,
+                    customer_name TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    project_type TEXT NOT NULL,
+                    service_type TEXT DEFAULT 'Internet Service',
+                    status TEXT NOT NULL DEFAULT 'in_progress',
+                    boq_cost DECIMAL(10,2),
+                    requester_name TEXT,
+                    department TEXT,
+                    date_request_received DATE NOT NULL,
+                    target_days INTEGER,
+                    sent_out_date DATE,
+                    duration_days INTEGER DEFAULT 0,
+                    team_member_involved TEXT NOT NULL,
+                    comment TEXT,
+                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_requests_received
+                ON requests(date_request_received)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_requests_overdue
+                ON requests(target_days, status, date_request_received)
+                WHERE target_days IS NOT NULL
+            ''')
+
+            # The status prefix also serves status-only predicates: the
+            # migration's WHERE status IN (...) seeks it and GROUP BY
+            # status scans it as a covering index
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_requests_status_sent
+                ON requests(status, sent_out_date)
+            ''')
+
+            # Report date ranges seek these instead of scanning the table
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_requests_created
+                ON requests(created_date)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_requests_sent
+                ON requests(sent_out_date)
+                WHERE sent_out_date IS NOT NULL
+            ''')
+
+            # Requests plus the real-time duration as a queryable column;
+            # wdays() is registered on every pooled connection
+            cursor.execute('''
+                CREATE VIEW IF NOT EXISTS v_requests AS
+                SELECT r.*,
+                       CASE WHEN status = 'Closed Request' THEN duration_days
+                            ELSE wdays(date_request_received, date('now'))
+                       END AS live_duration_days
+                FROM requests r
+            ''')
+
     @staticmethod
     def create(data: Dict) -> int:
         """Create a new request"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Generate custom ID based on service type
-        service_type = data.get('service_type', 'Internet Service')
-        custom_id = generate_custom_id(service_type)
-        
-        # Calculate initial duration
-        duration = calculate_working_days(data['date_request_received'])
-        
-        cursor.execute('''
-            INSERT INTO requests (
-                custom_id, customer_name, description, project_type, service_type, status, boq_cost,
-                requester_name, department, date_request_received, target_days,
-                team_member_involved, comment, duration_days
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            custom_id,
-            data['customer_name'],
-            data['description'],
-            data.get('project_type', ''),  # Keep for backward compatibility
-            service_type,
-            'in_progress',  # Default status
-            data.get('boq_cost'),
-            data.get('requester_name'),
-            data.get('department'),
-            data['date_request_received'],
-            data.get('target_days'),
-            data['team_member_involved'],
-            data.get('comment', ''),
-            duration
-        ))
-        
-        request_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return request_id
+        with get_connection() as conn, conn:
+            cursor = conn.cursor()
+
+            service_type = data.get('service_type', 'Internet Service')
+
+            # Calculate initial duration
+            duration = calculate_working_days(data['date_request_received'])
+
+            # Take the write lock up front so the MAX(custom_id) read and
+            # the insert are atomic - two concurrent creates cannot pick the
+            # same sequential number
+            cursor.execute('BEGIN IMMEDIATE')
+            custom_id = generate_custom_id(cursor, service_type)
+
+            cursor.execute('''
+                INSERT INTO requests (
+                    custom_id, customer_name, description, project_type, service_type, status, boq_cost,
+                    requester_name, department, date_request_received, target_days,
+                    team_member_involved, comment, duration_days
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                RETURNING id
+            ''', (
+                custom_id,
+                data['customer_name'],
+                data['description'],
+                data.get('project_type', ''),  # Keep for backward compatibility
+                service_type,
+                'in_progress',  # Default status
+                data.get('boq_cost'),
+                data.get('requester_name'),
+                data.get('department'),
+                data['date_request_received'],
+                data.get('target_days'),
+                data['team_member_involved'],
+                data.get('comment', ''),
+                duration
+            ))
+        
+            request_id = cursor.fetchone()['id']
+
+            return request_id
     
     @staticmethod
     def get_status_sort_order(status: str) -> int:
         """Get sort order for status (lower number = higher priority)"""
-        status_order = {
-            'Closed Request': 1,
-            'Pending with Presales': 2,
-            'Pending review': 3,
-            'Pending approval': 4,
-            'in_progress': 5
-        }
-        return status_order.get(status, 999)  # Unknown statuses go to the end
+        return _STATUS_ORDER.get(status, 999)  # Unknown statuses go to the end
+
+    # Same priority as get_status_sort_order, as a SQL fragment so report
+    # queries can return rows pre-sorted instead of re-sorting in Python
+    STATUS_ORDER_SQL = '''
+        ORDER BY CASE status
+            WHEN 'Closed Request' THEN 1
+            WHEN 'Pending with Presales' THEN 2
+            WHEN 'Pending review' THEN 3
+            WHEN 'Pending approval' THEN 4
+            WHEN 'in_progress' THEN 5
+            ELSE 999
+        END'''
 
     @staticmethod
-    def get_all(date_from=None, date_to=None, overdue_only=False) -> List[Dict]:
-        """Get all requests with optional filters"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Build query with filters
-        query = 'SELECT * FROM requests'
-        params = []
-        conditions = []
-        
-        if date_from:
-            conditions.append('date_request_received >= ?')
-            params.append(date_from)
-            
-        if date_to:
-            conditions.append('date_request_received <= ?')
-            params.append(date_to)
-            
-        if overdue_only:
-            conditions.append('target_days IS NOT NULL AND duration_days > target_days AND status != "Closed Request"')
-        
-        if conditions:
-            query += ' WHERE ' + ' AND '.join(conditions)
-            
-        query += ' ORDER BY created_date DESC'
-        
-        cursor.execute(query, params)
-        
-        requests = []
-        for row in cursor.fetchall():
-            request_dict = dict(row)
-            # Update duration for non-closed requests
-            if request_dict['status'] != 'Closed Request':
-                new_duration = calculate_working_days(request_dict['date_request_received'])
-                request_dict['duration_days'] = new_duration
-            requests.append(request_dict)
-        
-        conn.close()
-        return requests
+    def get_all(date_from=None, date_to=None, overdue_only=False,
+                limit=None, offset=0) -> List[Dict]:
+        """Get all requests with optional filters and pagination"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+        
+            # Single statement for every filter combination: NULL/zero params
+            # disable their predicate, so SQLite reuses one cached plan and can
+            # range-scan the date_request_received index. The v_requests view
+            # carries live_duration_days, so the overdue filter compares the
+            # real-time duration inline instead of the stored snapshot.
+            cursor.execute('''
+                SELECT * FROM v_requests
+                WHERE (:date_from IS NULL OR date_request_received >= :date_from)
+                AND (:date_to IS NULL OR date_request_received <= :date_to)
+                AND (:overdue_only = 0 OR (
+                    target_days IS NOT NULL
+                    AND live_duration_days > target_days
+                    AND status != 'Closed Request'
+                ))
+                ORDER BY created_date DESC
+                LIMIT :limit OFFSET :offset
+            ''', {
+                'date_from': date_from or None,
+                'date_to': date_to or None,
+                'overdue_only': 1 if overdue_only else 0,
+                'limit': limit if limit is not None else -1,  # -1 = no limit
+                'offset': offset
+            })
+        
+            requests = []
+            for request_dict in _iter_rows(cursor):
+                request_dict['duration_days'] = request_dict.pop('live_duration_days')
+                requests.append(request_dict)
+        
+            return requests
     
     @staticmethod
     def get_by_id(request_id: int) -> Optional[Dict]:
         """Get request by ID"""
-        conn = get_connection()
-        cursor = conn.cursor()
+        with get_connection() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('SELECT * FROM requests WHERE id = ?', (request_id,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        return dict(row) if row else None
+            cursor.execute('SELECT * FROM requests WHERE id = ?', (request_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
     
+    # Built UPDATE statements keyed by the set of changed fields; the edit
+    # forms only produce a handful of combinations, so after warm-up every
+    # update reuses an already-built (and sqlite3-cached) statement
+    _STMT_CACHE: Dict[frozenset, str] = {}
+
     @staticmethod
     def update(request_id: int, data: Dict, user_id: int = None, user_name: str = None) -> bool:
         """Update a request with activity logging"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Get current request data for logging
-        current_request = Request.get_by_id(request_id)
-        if not current_request:
-            conn.close()
-            return False
-        
-        # Auto-set sent_out_date if status is Closed Request
-        if data.get('status') == 'Closed Request':
-            if not data.get('sent_out_date'):
-                data['sent_out_date'] = date.today().strftime('%Y-%m-%d')
-        
-        # Calculate updated duration
-        if 'date_request_received' in data:
-            end_date = data.get('sent_out_date') if data.get('status') == 'Closed Request' else None
-            data['duration_days'] = calculate_working_days(data['date_request_received'], end_date)
-        
-        # Build dynamic update query
-        fields = []
-        values = []
-        for key, value in data.items():
-            if key != 'id':
-                fields.append(f"{key} = ?")
-                values.append(value)
-        
-        values.append(request_id)
-        
-        cursor.execute(f'''
-            UPDATE requests 
-            SET {", ".join(fields)}, updated_date = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', values)
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-        
-        # Log changes if user info provided
-        if success and user_id and user_name:
-            # Field mapping for readable names
-            field_labels = {
-                'status': 'Status',
-                'customer_name': 'Customer Name',
-                'description': 'Description',
-                'project_type': 'Project Type',
-                'boq_cost': 'BOQ Cost',
-                'requester_name': 'BM Name',
-                'department': 'Department',
-                'date_request_received': 'Date Request Received',
-                'target_days': 'Target Days',
-                'sent_out_date': 'Sent Out Date',
-                'team_member_involved': 'Team Member Involved',
-                'comment': 'Comment'
-            }
-            
-            # Log each changed field (exclude automatically calculated fields)
-            excluded_fields = ['duration_days', 'updated_date', 'created_date']
+        with get_connection() as conn, conn:
+            cursor = conn.cursor()
+
+            # Auto-set sent_out_date if status is Closed Request
+            if data.get('status') == 'Closed Request':
+                if not data.get('sent_out_date'):
+                    data['sent_out_date'] = date.today().strftime('%Y-%m-%d')
+        
+            # Calculate updated duration
+            if 'date_request_received' in data:
+                end_date = data.get('sent_out_date') if data.get('status') == 'Closed Request' else None
+                data['duration_days'] = calculate_working_days(data['date_request_received'], end_date)
+        
+            # Look up (or build once) the update statement for this field set
+            fields = frozenset(key for key in data if key != 'id')
+            sql = Request._STMT_CACHE.get(fields)
+            if sql is None:
+                assignments = ", ".join(f"{key} = ?" for key in sorted(fields))
+                sql = f'''
+                    UPDATE requests
+                    SET {assignments}, updated_date = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                '''
+                Request._STMT_CACHE[fields] = sql
+
+            # Pre-read the old values for diffing only when the change will
+            # be logged, and only the columns actually being written; the
+            # no-log path goes straight to the UPDATE
+            current_request = None
+            if user_id and user_name:
+                cursor.execute(
+                    f"SELECT {', '.join(sorted(fields))} FROM requests WHERE id = ?",
+                    (request_id,))
+                row = cursor.fetchone()
+                if row is None:
+                    return False
+                current_request = dict(row)
+
+            values = [data[key] for key in sorted(fields)]
+            values.append(request_id)
+            cursor.execute(sql, values)
+
+            success = cursor.rowcount > 0
+
+            # Log changes if user info provided
+            if success and user_id and user_name:
+                # Field mapping for readable names
+                field_labels = {
+                    'status': 'Status',
+                    'customer_name': 'Customer Name',
+                    'description': 'Description',
+                    'project_type': 'Project Type',
+                    'boq_cost': 'BOQ Cost',
+                    'requester_name': 'BM Name',
+                    'department': 'Department',
+                    'date_request_received': 'Date Request Received',
+                    'target_days': 'Target Days',
+                    'sent_out_date': 'Sent Out Date',
+                    'team_member_involved': 'Team Member Involved',
+                    'comment': 'Comment'
+                }
             
-            for field, new_value in data.items():
-                if field != 'id' and field in current_request and field not in excluded_fields:
-                    old_value = current_request[field]
-                    if str(old_value) != str(new_value):
-                        field_label = field_labels.get(field, field)
-                        action = f"Changed {field_label} from '{old_value}' to '{new_value}'"
-                        RequestLog.create_log(
-                            request_id=request_id,
-                            user_id=user_id,
-                            user_name=user_name,
-                            action=action,
-                            field_name=field,
-                            old_value=str(old_value) if old_value else None,
-                            new_value=str(new_value) if new_value else None
-                        )
-        
-        return success
+                # Log each changed field (exclude automatically calculated fields)
+                excluded_fields = ['duration_days', 'updated_date', 'created_date']
+
+                log_rows = []
+                for field, new_value in data.items():
+                    if field != 'id' and field in current_request and field not in excluded_fields:
+                        old_value = current_request[field]
+                        if str(old_value) != str(new_value):
+                            field_label = field_labels.get(field, field)
+                            action = f"Changed {field_label} from '{old_value}' to '{new_value}'"
+                            log_rows.append((
+                                request_id, user_id, user_name, action, field,
+                                str(old_value) if old_value else None,
+                                str(new_value) if new_value else None
+                            ))
+                # Same connection: the UPDATE and its log rows commit as
+                # one transaction
+                RequestLog.create_logs(log_rows, conn=conn)
+
+            return success
     
     @staticmethod
     def delete(request_id: int) -> bool:
         """Delete a request"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM requests WHERE id = ?', (request_id,))
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-        
-        return success
+        with get_connection() as conn, conn:
+            cursor = conn.cursor()
+
+            cursor.execute('DELETE FROM requests WHERE id = ?', (request_id,))
+            return cursor.rowcount > 0
     
     @staticmethod
     def get_stats() -> Dict:
         """Get dashboard statistics"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Total requests
-        cursor.execute('SELECT COUNT(*) as total FROM requests')
-        total = cursor.fetchone()['total']
-        
-        # Requests by status
-        cursor.execute('SELECT status, COUNT(*) as count FROM requests GROUP BY status')
-        status_counts = {row['status']: row['count'] for row in cursor.fetchall()}
-        
-        # Overdue requests (duration > target_days) - including closed requests
-        # Calculate overdue with real-time duration for non-closed requests
-        cursor.execute('''
-            SELECT id, status, date_request_received, target_days, duration_days 
-            FROM requests 
-            WHERE target_days IS NOT NULL
-        ''')
-        
-        overdue = 0
-        for row in cursor.fetchall():
-            request = dict(row)
-            current_duration = request['duration_days']
-            
-            # Use real-time calculation for non-closed requests
-            if request['status'] != 'Closed Request':
-                current_duration = calculate_working_days(request['date_request_received'])
-            
-            target_days = request['target_days']
-            if target_days:
-                try:
-                    target_days_int = int(target_days) if isinstance(target_days, str) else target_days
-                    if target_days_int > 0 and current_duration > target_days_int:
-                        overdue += 1
-                except (ValueError, TypeError):
-                    pass  # Skip invalid target_days values
-        
-        # Closed this week
-        cursor.execute('''
-            SELECT COUNT(*) as closed_week FROM requests 
-            WHERE status = 'Closed Request' 
-            AND sent_out_date >= date('now', '-7 days')
-        ''')
-        closed_week = cursor.fetchone()['closed_week']
-        
-        conn.close()
-        
-        return {
-            'total': total,
-            'in_progress': status_counts.get('in_progress', 0),
-            'pending': sum(status_counts.get(status, 0) for status in [
-                'Pending with Presales', 'Pending review', 'Pending approval'
-            ]),
-            'closed': status_counts.get('Closed Request', 0),
-            'overdue': overdue,
-            'closed_week': closed_week
-        }
+        with get_connection() as conn:
+            cursor = conn.cursor()
+        
+            # One pass over the table computes every card on the dashboard;
+            # SUM(CASE ...) replaces the separate total/status/closed-week
+            # queries. Overdue compares the live duration (stored snapshot
+            # for closed requests, wdays() otherwise) against target_days;
+            # CAST maps non-numeric target_days to 0, which the > 0 guard
+            # filters out just like the old per-row validation.
+            cursor.execute('''
+                SELECT
+                    COUNT(*) as total,
+                    SUM(status = 'in_progress') as in_progress,
+                    SUM(status IN ('Pending with Presales', 'Pending review',
+                                   'Pending approval')) as pending,
+                    SUM(status = 'Closed Request') as closed,
+                    SUM(target_days IS NOT NULL
+                        AND CAST(target_days AS INTEGER) > 0
+                        AND (CASE WHEN status = 'Closed Request' THEN duration_days
+                                  ELSE wdays(date_request_received, date('now'))
+                             END) > CAST(target_days AS INTEGER)) as overdue,
+                    SUM(status = 'Closed Request'
+                        AND sent_out_date >= date('now', '-7 days')) as closed_week
+                FROM requests
+            ''')
+            row = cursor.fetchone()
+
+            # SUM over an empty table yields NULL, not 0
+            return {key: row[key] or 0 for key in row.keys()}
     
+    @staticmethod
+    def get_report_mtime() -> Optional[str]:
+        """Get the most recent update timestamp across all requests.
+
+        Used as the Last-Modified value for report endpoints so clients can
+        revalidate with conditional GETs.
+        """
+        with get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('SELECT MAX(updated_date) as mtime FROM requests')
+            row = cursor.fetchone()
+
+            return row['mtime'] if row else None
+
+    @staticmethod
+    def _get_report_counts(cursor, start_date: str, end_date: str) -> Dict:
+        """Fetch the created/completed/in_progress/overdue counts in one query.
+
+        The four counts used to be four separate statements per report;
+        scalar subqueries collapse them into a single round trip.
+        """
+        cursor.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM requests
+                 WHERE created_date >= :start AND created_date < :end) as created,
+                (SELECT COUNT(*) FROM requests
+                 WHERE sent_out_date >= :start AND sent_out_date < :end
+                 AND status = 'Closed Request') as completed,
+                (SELECT COUNT(*) FROM requests
+                 WHERE status = 'in_progress') as in_progress,
+                (SELECT COUNT(*) FROM requests
+                 WHERE target_days IS NOT NULL
+                 AND duration_days > target_days) as overdue
+        ''', {'start': start_date, 'end': _next_day(end_date)})
+        return dict(cursor.fetchone())
+
     @staticmethod
     def get_daily_report(target_date: str) -> Dict:
         """Get daily report data"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Requests created today
-        cursor.execute('''
-            SELECT COUNT(*) as created FROM requests 
-            WHERE DATE(created_date) = ?
-        ''', (target_date,))
-        created = cursor.fetchone()['created']
-        
-        # Requests completed today
-        cursor.execute('''
-            SELECT COUNT(*) as completed FROM requests 
-            WHERE DATE(sent_out_date) = ? AND status = 'Closed Request'
-        ''', (target_date,))
-        completed = cursor.fetchone()['completed']
-        
-        # Current in progress
-        cursor.execute('''
-            SELECT COUNT(*) as in_progress FROM requests 
-            WHERE status = 'in_progress'
-        ''')
-        in_progress = cursor.fetchone()['in_progress']
-        
-        # Current overdue
-        cursor.execute('''
-            SELECT COUNT(*) as overdue FROM requests 
-            WHERE target_days IS NOT NULL 
-            AND duration_days > target_days 
-        ''')
-        overdue = cursor.fetchone()['overdue']
-        
-        # Today's activities from logs
-        cursor.execute('''
-            SELECT rl.*, r.customer_name 
-            FROM request_logs rl
-            JOIN requests r ON rl.request_id = r.id
-            WHERE DATE(rl.timestamp) = ?
-            ORDER BY rl.timestamp DESC
-            LIMIT 50
-        ''', (target_date,))
-        activities = [dict(row) for row in cursor.fetchall()]
-        
-        # All active requests + requests closed on this day
-        cursor.execute('''
-            SELECT * FROM requests 
-            WHERE status != 'Closed Request' 
-            OR DATE(sent_out_date) = ?
-        ''', (target_date,))
-        requests = [dict(row) for row in cursor.fetchall()]
-        
-        # Sort by status priority (Closed, Pending with Presales, Pending review, Pending approval, in_progress)
-        requests.sort(key=lambda x: Request.get_status_sort_order(x['status']))
-        
-        conn.close()
-        
-        return {
-            'created': created,
-            'completed': completed,
-            'in_progress': in_progress,
-            'overdue': overdue,
-            'activities': activities,
-            'requests': requests
-        }
-    
+        with get_connection() as conn:
+            cursor = conn.cursor()
+
+            next_day = _next_day(target_date)
+
+            counts = Request._get_report_counts(cursor, target_date, target_date)
+
+            # Today's activities from logs
+            cursor.execute('''
+                SELECT rl.*, r.customer_name
+                FROM request_logs rl
+                JOIN requests r ON rl.request_id = r.id
+                WHERE rl.timestamp >= ? AND rl.timestamp < ?
+                ORDER BY rl.timestamp DESC
+                LIMIT 50
+            ''', (target_date, next_day))
+            activities = list(_iter_rows(cursor))
+
+            # All active requests + requests closed on this day, sorted by
+            # status priority (Closed, Pending with Presales, Pending review,
+            # Pending approval, in_progress)
+            cursor.execute('''
+                SELECT * FROM requests
+                WHERE status != 'Closed Request'
+                OR (sent_out_date >= ? AND sent_out_date < ?)
+            ''' + Request.STATUS_ORDER_SQL, (target_date, next_day))
+            requests = list(_iter_rows(cursor))
+
+
+            return {
+                **counts,
+                'activities': activities,
+                'requests': requests
+            }
+
     @staticmethod
     def get_weekly_report(year: int, week: int) -> Dict:
         """Get weekly report data"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Calculate week start and end dates
-        from datetime import datetime, timedelta
-        jan_1 = datetime(year, 1, 1)
-        week_start = jan_1 + timedelta(weeks=week-1) - timedelta(days=jan_1.weekday())
-        week_end = week_start + timedelta(days=6)
-        
-        start_date = week_start.strftime('%Y-%m-%d')
-        end_date = week_end.strftime('%Y-%m-%d')
-        
-        # Requests created this week
-        cursor.execute('''
-            SELECT COUNT(*) as created FROM requests 
-            WHERE DATE(created_date) BETWEEN ? AND ?
-        ''', (start_date, end_date))
-        created = cursor.fetchone()['created']
-        
-        # Requests completed this week
-        cursor.execute('''
-            SELECT COUNT(*) as completed FROM requests 
-            WHERE DATE(sent_out_date) BETWEEN ? AND ? AND status = 'Closed Request'
-        ''', (start_date, end_date))
-        completed = cursor.fetchone()['completed']
-        
-        # Current in progress
-        cursor.execute('''
-            SELECT COUNT(*) as in_progress FROM requests 
-            WHERE status = 'in_progress'
-        ''')
-        in_progress = cursor.fetchone()['in_progress']
-        
-        # Current overdue
-        cursor.execute('''
-            SELECT COUNT(*) as overdue FROM requests 
-            WHERE target_days IS NOT NULL 
-            AND duration_days > target_days 
-        ''')
-        overdue = cursor.fetchone()['overdue']
-        
-        # Status breakdown
-        cursor.execute('''
-            SELECT status, COUNT(*) as count FROM requests 
-            WHERE DATE(created_date) BETWEEN ? AND ?
-            GROUP BY status
-        ''', (start_date, end_date))
-        status_breakdown = [{'name': row['status'], 'count': row['count']} for row in cursor.fetchall()]
-        
-        # Team performance
-        cursor.execute('''
-            SELECT team_member_involved as name, 
-                   COUNT(CASE WHEN status = 'Closed Request' THEN 1 END) as completed
-            FROM requests 
-            WHERE DATE(created_date) BETWEEN ? AND ?
-            GROUP BY team_member_involved
-        ''', (start_date, end_date))
-        team_performance = [dict(row) for row in cursor.fetchall()]
-        
-        # Week's activities from logs
-        cursor.execute('''
-            SELECT rl.*, r.customer_name 
-            FROM request_logs rl
-            JOIN requests r ON rl.request_id = r.id
-            WHERE DATE(rl.timestamp) BETWEEN ? AND ?
-            ORDER BY rl.timestamp DESC
-            LIMIT 100
-        ''', (start_date, end_date))
-        activities = [dict(row) for row in cursor.fetchall()]
-        
-        # All active requests + requests closed this week
-        cursor.execute('''
-            SELECT * FROM requests 
-            WHERE status != 'Closed Request' 
-            OR DATE(sent_out_date) BETWEEN ? AND ?
-        ''', (start_date, end_date))
-        requests = [dict(row) for row in cursor.fetchall()]
-        
-        # Sort by status priority (Closed, Pending with Presales, Pending review, Pending approval, in_progress)
-        requests.sort(key=lambda x: Request.get_status_sort_order(x['status']))
-        
-        conn.close()
-        
-        return {
-            'created': created,
-            'completed': completed,
-            'in_progress': in_progress,
-            'overdue': overdue,
-            'status_breakdown': status_breakdown,
-            'team_performance': team_performance,
-            'activities': activities,
-            'requests': requests
-        }
+        with get_connection() as conn:
+            cursor = conn.cursor()
+        
+            # Calculate week start and end dates
+            from datetime import datetime, timedelta
+            jan_1 = datetime(year, 1, 1)
+            week_start = jan_1 + timedelta(weeks=week-1) - timedelta(days=jan_1.weekday())
+            week_end = week_start + timedelta(days=6)
+        
+            start_date = week_start.strftime('%Y-%m-%d')
+            end_date = week_end.strftime('%Y-%m-%d')
+            next_day = _next_day(end_date)
+
+            counts = Request._get_report_counts(cursor, start_date, end_date)
+
+            # Status breakdown
+            cursor.execute('''
+                SELECT status, COUNT(*) as count FROM requests
+                WHERE created_date >= ? AND created_date < ?
+                GROUP BY status
+            ''', (start_date, next_day))
+            status_breakdown = [{'name': row['status'], 'count': row['count']} for row in cursor.fetchall()]
+
+            # Team performance
+            cursor.execute('''
+                SELECT team_member_involved as name,
+                       COUNT(CASE WHEN status = 'Closed Request' THEN 1 END) as completed
+                FROM requests
+                WHERE created_date >= ? AND created_date < ?
+                GROUP BY team_member_involved
+            ''', (start_date, next_day))
+            team_performance = list(_iter_rows(cursor))
+
+            # Week's activities from logs
+            cursor.execute('''
+                SELECT rl.*, r.customer_name
+                FROM request_logs rl
+                JOIN requests r ON rl.request_id = r.id
+                WHERE rl.timestamp >= ? AND rl.timestamp < ?
+                ORDER BY rl.timestamp DESC
+                LIMIT 100
+            ''', (start_date, next_day))
+            activities = list(_iter_rows(cursor))
+
+            # All active requests + requests closed this week, sorted by
+            # status priority
+            cursor.execute('''
+                SELECT * FROM requests
+                WHERE status != 'Closed Request'
+                OR (sent_out_date >= ? AND sent_out_date < ?)
+            ''' + Request.STATUS_ORDER_SQL, (start_date, next_day))
+            requests = list(_iter_rows(cursor))
+
+
+            return {
+                **counts,
+                'status_breakdown': status_breakdown,
+                'team_performance': team_performance,
+                'activities': activities,
+                'requests': requests
+            }
     
     @staticmethod
     def get_monthly_report(year: int, month: int) -> Dict:
         """Get monthly report data"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Calculate month start and end
-        from calendar import monthrange
-        start_date = f"{year}-{month:02d}-01"
-        _, last_day = monthrange(year, month)
-        end_date = f"{year}-{month:02d}-{last_day}"
-        
-        # Requests created this month
-        cursor.execute('''
-            SELECT COUNT(*) as created FROM requests 
-            WHERE DATE(created_date) BETWEEN ? AND ?
-        ''', (start_date, end_date))
-        created = cursor.fetchone()['created']
-        
-        # Completed requests this month
-        cursor.execute('''
-            SELECT COUNT(*) as completed FROM requests 
-            WHERE DATE(sent_out_date) BETWEEN ? AND ? AND status = 'Closed Request'
-        ''', (start_date, end_date))
-        completed = cursor.fetchone()['completed']
-        
-        # Current in progress
-        cursor.execute('''
-            SELECT COUNT(*) as in_progress FROM requests 
-            WHERE status = 'in_progress'
-        ''')
-        in_progress = cursor.fetchone()['in_progress']
-        
-        # Current overdue
-        cursor.execute('''
-            SELECT COUNT(*) as overdue FROM requests 
-            WHERE target_days IS NOT NULL 
-            AND duration_days > target_days 
-        ''')
-        overdue = cursor.fetchone()['overdue']
-        
-        # Project type analysis
-        cursor.execute('''
-            SELECT 
-                project_type as name,
-                COUNT(*) as count,
-                AVG(duration_days) as avg_days
-            FROM requests 
-            WHERE DATE(created_date) BETWEEN ? AND ?
-            GROUP BY project_type
-            ORDER BY count DESC
-        ''', (start_date, end_date))
-        project_types = [{'name': row['name'], 'count': row['count'], 'avg_days': round(row['avg_days'] or 0, 1)} for row in cursor.fetchall()]
-        
-        # Department analysis
-        cursor.execute('''
-            SELECT 
-                department as name,
-                COUNT(*) as requests,
-                AVG(duration_days) as avg_response
-            FROM requests 
-            WHERE DATE(created_date) BETWEEN ? AND ?
-            GROUP BY department
-            ORDER BY requests DESC
-        ''', (start_date, end_date))
-        departments = [{'name': row['name'], 'requests': row['requests'], 'avg_response': f"{round(row['avg_response'] or 0, 1)} days"} for row in cursor.fetchall()]
-        
-        # Month's activities from logs
-        cursor.execute('''
-            SELECT rl.*, r.customer_name 
-            FROM request_logs rl
-            JOIN requests r ON rl.request_id = r.id
-            WHERE DATE(rl.timestamp) BETWEEN ? AND ?
-            ORDER BY rl.timestamp DESC
-            LIMIT 200
-        ''', (start_date, end_date))
-        activities = [dict(row) for row in cursor.fetchall()]
-        
-        # All active requests + requests closed this month
-        cursor.execute('''
-            SELECT * FROM requests 
-            WHERE status != 'Closed Request' 
-            OR DATE(sent_out_date) BETWEEN ? AND ?
-        ''', (start_date, end_date))
-        requests = [dict(row) for row in cursor.fetchall()]
-        
-        # Sort by status priority (Closed, Pending with Presales, Pending review, Pending approval, in_progress)
-        requests.sort(key=lambda x: Request.get_status_sort_order(x['status']))
-        
-        conn.close()
-        
-        return {
-            'created': created,
-            'completed': completed,
-            'in_progress': in_progress,
-            'overdue': overdue,
-            'project_types': project_types,
-            'departments': departments,
-            'activities': activities,
-            'requests': requests
-        }
+        with get_connection() as conn:
+            cursor = conn.cursor()
+        
+            # Calculate month start and end
+            from calendar import monthrange
+            start_date = f"{year}-{month:02d}-01"
+            _, last_day = monthrange(year, month)
+            end_date = f"{year}-{month:02d}-{last_day}"
+            next_day = _next_day(end_date)
+
+            counts = Request._get_report_counts(cursor, start_date, end_date)
+
+            # Project type analysis
+            cursor.execute('''
+                SELECT
+                    project_type as name,
+                    COUNT(*) as count,
+                    AVG(duration_days) as avg_days
+                FROM requests
+                WHERE created_date >= ? AND created_date < ?
+                GROUP BY project_type
+                ORDER BY count DESC
+            ''', (start_date, next_day))
+            project_types = [{'name': row['name'], 'count': row['count'], 'avg_days': round(row['avg_days'] or 0, 1)} for row in cursor.fetchall()]
+        
+            # Department analysis
+            cursor.execute('''
+                SELECT 
+                    department as name,
+                    COUNT(*) as requests,
+                    AVG(duration_days) as avg_response
+                FROM requests
+                WHERE created_date >= ? AND created_date < ?
+                GROUP BY department
+                ORDER BY requests DESC
+            ''', (start_date, next_day))
+            departments = [{'name': row['name'], 'requests': row['requests'], 'avg_response': f"{round(row['avg_response'] or 0, 1)} days"} for row in cursor.fetchall()]
+        
+            # Month's activities from logs
+            cursor.execute('''
+                SELECT rl.*, r.customer_name 
+                FROM request_logs rl
+                JOIN requests r ON rl.request_id = r.id
+                WHERE rl.timestamp >= ? AND rl.timestamp < ?
+                ORDER BY rl.timestamp DESC
+                LIMIT 200
+            ''', (start_date, next_day))
+            activities = list(_iter_rows(cursor))
+
+            # All active requests + requests closed this month, sorted by
+            # status priority
+            cursor.execute('''
+                SELECT * FROM requests
+                WHERE status != 'Closed Request'
+                OR (sent_out_date >= ? AND sent_out_date < ?)
+            ''' + Request.STATUS_ORDER_SQL, (start_date, next_day))
+            requests = list(_iter_rows(cursor))
+
+
+            return {
+                **counts,
+                'project_types': project_types,
+                'departments': departments,
+                'activities': activities,
+                'requests': requests
+            }
 
 class RequestLog:
     """Request activity log model"""
     
     @staticmethod
-    def create_table():
+    def create_table(conn: sqlite3.Connection = None):
         """Create the request_logs table"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS request_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                request_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                user_name TEXT NOT NULL,
-                action TEXT NOT NULL,
-                field_name TEXT,
-                old_value TEXT,
-                new_value TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (request_id) REFERENCES requests (id),
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-    
+        if conn is None:
+            with get_connection() as conn, conn:
+                RequestLog.create_table(conn)
+        else:
+            cursor = conn.cursor()
+        
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS request_logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    request_id INTEGER NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    user_name TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    field_name TEXT,
+                    old_value TEXT,
+                    new_value TEXT,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (request_id) REFERENCES requests (id),
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            ''')
+
+            # Report activity ranges and per-request log listings; carrying
+            # request_id makes the index cover the driving side of the
+            # activities JOIN, so the range scan feeds the requests lookup
+            # without touching the log table rows
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_logs_ts_request
+                ON request_logs(timestamp, request_id)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_logs_request
+                ON request_logs(request_id, timestamp DESC)
+            ''')
+
     @staticmethod
-    def create_log(request_id: int, user_id: int, user_name: str, action: str, 
+    def create_log(request_id: int, user_id: int, user_name: str, action: str,
                    field_name: str = None, old_value: str = None, new_value: str = None):
         """Create a new log entry"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        with get_connection() as conn, conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT INTO request_logs (request_id, user_id, user_name, action, field_name, old_value, new_value)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (request_id, user_id, user_name, action, field_name, old_value, new_value))
+
+    @staticmethod
+    def create_logs(rows: List[tuple], conn: sqlite3.Connection = None):
+        """Insert a batch of log rows in one executemany call.
+
+        Each row is (request_id, user_id, user_name, action, field_name,
+        old_value, new_value). When `conn` is given the inserts run on the
+        caller's connection and join its open transaction; otherwise a
+        pooled connection commits the batch on its own.
+        """
+        if not rows:
+            return
+        sql = '''
             INSERT INTO request_logs (request_id, user_id, user_name, action, field_name, old_value, new_value)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (request_id, user_id, user_name, action, field_name, old_value, new_value))
-        
-        conn.commit()
-        conn.close()
+        '''
+        if conn is not None:
+            conn.executemany(sql, rows)
+            return
+        with get_connection() as conn, conn:
+            conn.executemany(sql, rows)
     
     @staticmethod
     def get_logs_for_request(request_id: int) -> List[Dict]:
         """Get all logs for a specific request"""
-        conn = get_connection()
-        cursor = conn.cursor()
+        with get_connection() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT * FROM request_logs 
-            WHERE request_id = ? 
-            ORDER BY timestamp DESC
-        ''', (request_id,))
+            cursor.execute('''
+                SELECT * FROM request_logs 
+                WHERE request_id = ? 
+                ORDER BY timestamp DESC
+            ''', (request_id,))
         
-        logs = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+            logs = list(_iter_rows(cursor))
         
-        return logs
+            return logs
 
 class User:
     """User model"""
@@ -782,139 +902,157 @@ class User:
     ROLES = ['admin', 'user']
     
     @staticmethod
-    def create_table():
+    def create_table(conn: sqlite3.Connection = None):
         """Create the users table"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                full_name TEXT NOT NULL,
-                email TEXT,
-                department TEXT,
-                role TEXT DEFAULT 'user',
-                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-    
+        if conn is None:
+            with get_connection() as conn, conn:
+                User.create_table(conn)
+        else:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    full_name TEXT NOT NULL,
+                    email TEXT,
+                    department TEXT,
+                    role TEXT DEFAULT 'user',
+                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
     @staticmethod
-    def create(username: str, password: str, full_name: str, email: str = None, 
-               department: str = None, role: str = 'user') -> int:
+    def create(username: str, password: str, full_name: str, email: str = None,
+               department: str = None, role: str = 'user',
+               conn: sqlite3.Connection = None) -> int:
         """Create a new user"""
-        conn = get_connection()
+        if conn is None:
+            with get_connection() as conn, conn:
+                return User.create(username, password, full_name, email, department, role,
+                                   conn=conn)
+
         cursor = conn.cursor()
-        
-        password_hash = simple_hash(password)
-        
+
+        password_hash = hash_password(password)
+
         cursor.execute('''
             INSERT INTO users (username, password_hash, full_name, email, department, role)
             VALUES (?, ?, ?, ?, ?, ?)
         ''', (username, password_hash, full_name, email, department, role))
-        
-        user_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return user_id
+
+        return cursor.lastrowid
     
     @staticmethod
     def get_by_username(username: str) -> Optional[Dict]:
         """Get user by username"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
-        row = cursor.fetchone()
-        conn.close()
+        with get_connection() as conn:
+            cursor = conn.cursor()
         
-        return dict(row) if row else None
+            cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
     
     @staticmethod
     def get_by_id(user_id: int) -> Optional[Dict]:
         """Get user by ID"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM users WHERE id = ?', (user_id,))
-        row = cursor.fetchone()
-        conn.close()
+        with get_connection() as conn:
+            cursor = conn.cursor()
         
-        return dict(row) if row else None
+            cursor.execute('SELECT * FROM users WHERE id = ?', (user_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
     
     @staticmethod
     def get_all() -> List[Dict]:
-        """Get all users"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM users ORDER BY full_name')
-        users = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        return users
+        """Get all users (without password hashes)"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+
+            # Explicit projection: callers serve these rows as JSON, so
+            # password_hash must never ride along
+            cursor.execute('''
+                SELECT id, username, full_name, email, department, role
+                FROM users ORDER BY full_name
+            ''')
+            users = list(_iter_rows(cursor))
+
+            return users
     
     @staticmethod
     def verify_password(stored_hash: str, password: str) -> bool:
-        """Verify password against stored hash"""
-        return stored_hash == simple_hash(password)
+        """Verify password against stored hash (PBKDF2 or legacy SHA256)"""
+        # compare_digest on both paths: str.__eq__ short-circuits on the
+        # first differing byte, which leaks hash-prefix timing
+        if stored_hash.startswith('pbkdf2_sha256$'):
+            _, iterations, salt_hex, dk_hex = stored_hash.split('$')
+            dk = hashlib.pbkdf2_hmac('sha256', password.encode(),
+                                     bytes.fromhex(salt_hex), int(iterations))
+            return hmac.compare_digest(dk.hex(), dk_hex)
+        # Accounts created before the KDF switch
+        return hmac.compare_digest(stored_hash, simple_hash(password))
 
 def migrate_status_values():
     """Migrate old status values to new ones"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    print("Starting status migration...")
-    
-    # Check current status counts before migration
-    cursor.execute("SELECT status, COUNT(*) FROM requests GROUP BY status")
-    before_counts = cursor.fetchall()
-    print("\nStatus counts before migration:")
-    for row in before_counts:
-        print(f"  {row['status']}: {row['COUNT(*)']}")
-    
-    # Update the status values
-    updates = [
-        ("Pending with jane", "Pending review"),
-        ("Pending Review with mahmud", "Pending approval")
-    ]
+    with get_connection() as conn, conn:
+        cursor = conn.cursor()
     
-    total_updated = 0
-    for old_status, new_status in updates:
-        cursor.execute("UPDATE requests SET status = ? WHERE status = ?", (new_status, old_status))
-        updated_count = cursor.rowcount
-        total_updated += updated_count
-        print(f"\nUpdated {updated_count} records from '{old_status}' to '{new_status}'")
+        print("Starting status migration...")
     
-    # Commit the changes
-    conn.commit()
+        # Check current status counts before migration
+        cursor.execute("SELECT status, COUNT(*) FROM requests GROUP BY status")
+        before_counts = cursor.fetchall()
+        print("\nStatus counts before migration:")
+        for row in before_counts:
+            print(f"  {row['status']}: {row['COUNT(*)']}")
     
-    # Check status counts after migration
-    cursor.execute("SELECT status, COUNT(*) FROM requests GROUP BY status")
-    after_counts = cursor.fetchall()
-    print("\nStatus counts after migration:")
-    for row in after_counts:
-        print(f"  {row['status']}: {row['COUNT(*)']}")
+        # Update the status values; new migrations only need another tuple
+        updates = [
+            ("Pending with jane", "Pending review"),
+            ("Pending Review with mahmud", "Pending approval")
+        ]
+
+        # One CASE UPDATE over all mappings instead of a statement per old
+        # value: a single plan and a single pass over the table
+        whens = " ".join("WHEN ? THEN ?" for _ in updates)
+        placeholders = ", ".join("?" for _ in updates)
+        params = [value for pair in updates for value in pair] + [old for old, _ in updates]
+        cursor.execute(f'''
+            UPDATE requests
+            SET status = CASE status {whens} ELSE status END
+            WHERE status IN ({placeholders})
+        ''', params)
+        total_updated = cursor.rowcount
+        for old_status, new_status in updates:
+            print(f"\nMapped '{old_status}' to '{new_status}'")
+
+        # Check status counts after migration
+        cursor.execute("SELECT status, COUNT(*) FROM requests GROUP BY status")
+        after_counts = cursor.fetchall()
+        print("\nStatus counts after migration:")
+        for row in after_counts:
+            print(f"  {row['status']}: {row['COUNT(*)']}")
     
-    conn.close()
     
-    print(f"\nMigration completed! Total records updated: {total_updated}")
-    return total_updated
+        print(f"\nMigration completed! Total records updated: {total_updated}")
+        return total_updated
 
 def init_database():
     """Initialize database with proper schema"""
-    Request.create_table()
-    User.create_table()
-    RequestLog.create_table()
-    
-    # Create default admin user if it doesn't exist
-    if not User.get_by_username('admin'):
-        User.create('admin', 'admin123', 'Administrator', 'admin@company.com', 'IT', 'admin')
+    # One connection, one transaction: the three schemas and the admin
+    # bootstrap commit together with a single fsync
+    with get_connection() as conn, conn:
+        Request.create_table(conn)
+        User.create_table(conn)
+        RequestLog.create_table(conn)
+
+        # Create default admin user if it doesn't exist
+        cursor = conn.cursor()
+        cursor.execute('SELECT 1 FROM users WHERE username = ?', ('admin',))
+        if cursor.fetchone() is None:
+            User.create('admin', 'admin123', 'Administrator', 'admin@company.com', 'IT', 'admin',
+                        conn=conn)
     
     print("Database initialized successfully!")
 
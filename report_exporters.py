@@ -2,60 +2,84 @@
 Report Export Utilities for PDF and Excel generation
 """
 import io
+from collections import Counter
 from datetime import datetime
 from typing import Dict, List
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4, landscape
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
 
+# Status colour palette, one lookup table per output format, built once at
+# import instead of per get_status_color call; rgb and reportlab variants
+# derive from the hex values so the palette lives in one place
+_STATUS_HEX = {
+    'in_progress': '#FEF3C7',            # yellow-100
+    'Pending with Presales': '#E5E7EB',  # gray-200
+    'Pending review': '#E9D5FF',         # purple-200
+    'Pending approval': '#FED7AA',       # orange-200
+    'Closed Request': '#DCFCE7'          # green-100
+}
+_STATUS_RGB = {status: tuple(int(value[i:i + 2], 16) for i in (1, 3, 5))
+               for status, value in _STATUS_HEX.items()}
+_STATUS_REPORTLAB = {status: colors.Color(r/255, g/255, b/255)
+                     for status, (r, g, b) in _STATUS_RGB.items()}
+
+_STATUS_COLORS = {'hex': _STATUS_HEX, 'rgb': _STATUS_RGB, 'reportlab': _STATUS_REPORTLAB}
+_DEFAULT_COLORS = {'hex': '#FFFFFF', 'rgb': (255, 255, 255), 'reportlab': colors.white}
+
+# Shared openpyxl style singletons, so the per-cell loop assigns by
+# reference instead of allocating a new style object for every cell
+_LEFT_ALIGN = Alignment(horizontal="left", vertical="center")
+_CENTER_ALIGN = Alignment(horizontal="center", vertical="center")
+_STATUS_FILLS = {status: PatternFill(start_color=value[1:], end_color=value[1:], fill_type="solid")
+                 for status, value in _STATUS_HEX.items()}
+_OVERDUE_FILL = PatternFill(start_color="FECACA", end_color="FECACA", fill_type="solid")  # red-200
+
+def _prepare_row(req: Dict, index: int) -> tuple:
+    """Build the 11-column request row shared by the PDF and Excel exporters.
+
+    Row-derived scalars are fetched once each, and both exporters consume
+    the same tuple so the formatting cannot drift between formats.
+    """
+    boq = req.get('boq_cost')
+    td = req.get('target_days')
+    sent = req.get('sent_out_date')
+    return (
+        index,  # Sequential numbering
+        req.get('customer_name', ''),
+        req.get('description', ''),
+        f"NGN {boq:,.2f}" if boq else 'N/A',
+        req.get('requester_name', ''),
+        req.get('date_request_received', ''),
+        td if td else 'N/A',
+        sent if sent else 'N/A',
+        req.get('duration_days', 0),
+        req.get('team_member_involved', ''),
+        req.get('comment', '') or ''
+    )
+
+
+# Columns whose values are short and never wrap (S/N, target days,
+# sent-out date, duration); the PDF table renders these as plain strings
+# instead of paying Paragraph markup parsing per cell
+_SHORT_COLUMNS = frozenset((0, 6, 7, 8))
+
+
 class ReportExporter:
     """Base class for report export functionality"""
-    
+
     @staticmethod
     def get_status_color(status: str, format_type: str = 'hex'):
         """Get color for status with proper formatting"""
-        colors_map = {
-            'in_progress': {
-                'hex': '#FEF3C7',  # yellow-100
-                'rgb': (254, 243, 199),
-                'reportlab': colors.Color(254/255, 243/255, 199/255)
-            },
-            'Pending with Presales': {
-                'hex': '#E5E7EB',  # gray-200
-                'rgb': (229, 231, 235),
-                'reportlab': colors.Color(229/255, 231/255, 235/255)
-            },
-            'Pending review': {
-                'hex': '#E9D5FF',  # purple-200
-                'rgb': (233, 213, 255),
-                'reportlab': colors.Color(233/255, 213/255, 255/255)
-            },
-            'Pending approval': {
-                'hex': '#FED7AA',  # orange-200
-                'rgb': (254, 215, 170),
-                'reportlab': colors.Color(254/255, 215/255, 170/255)
-            },
-            'Closed Request': {
-                'hex': '#DCFCE7',  # green-100
-                'rgb': (220, 252, 231),
-                'reportlab': colors.Color(220/255, 252/255, 231/255)
-            }
-        }
-        
-        default_color = {
-            'hex': '#FFFFFF',
-            'rgb': (255, 255, 255),
-            'reportlab': colors.white
-        }
-        
-        return colors_map.get(status, default_color).get(format_type, default_color[format_type])
+        return _STATUS_COLORS[format_type].get(status, _DEFAULT_COLORS[format_type])
     
     @staticmethod
     def is_overdue(request: Dict) -> bool:
@@ -66,7 +90,7 @@ class ReportExporter:
 
 class PDFExporter(ReportExporter):
     """PDF export functionality"""
-    
+
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self.title_style = ParagraphStyle(
@@ -97,15 +121,7 @@ class PDFExporter(ReportExporter):
             rightIndent=1,
             fontName='Helvetica-Bold'
         )
-        
-    def create_report_pdf(self, report_data: Dict, report_type: str, period: str) -> io.BytesIO:
-        """Create PDF report with color coding"""
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=landscape(A4), topMargin=0.5*inch, leftMargin=0.5*inch, rightMargin=0.5*inch)
-        story = []
-        
-        # Header with logo and team info
-        header_style = ParagraphStyle(
+        self.header_style = ParagraphStyle(
             'HeaderStyle',
             parent=self.styles['Normal'],
             fontSize=14,
@@ -113,15 +129,121 @@ class PDFExporter(ReportExporter):
             alignment=TA_CENTER,
             fontName='Helvetica-Bold'
         )
-        
+
+        # Immutable per-report objects, built once instead of per export:
+        # the header titles, the base table style ops and the summary
+        # metrics TableStyle. The header Paragraphs themselves are built
+        # per call — Paragraph.wrap() mutates the flowable during layout,
+        # so sharing them across the process-wide exporter instance would
+        # corrupt concurrent renders on the export worker pool.
+        self._header_titles = (
+            'S/N', 'Customer', 'Description', 'BOQ-Cost (NGN)', 'BM (Name)',
+            'Date Request Received', 'Target (working days)',
+            'Date Sent Out (Date sent to BD/RDIS/EBG)', 'Duration (Working days)',
+            'Team Member Involved', 'Comment'
+        )
+        self._base_table_style_ops = (
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 7),
+            # Plain-string cells take the table font; match the 8pt
+            # Paragraph cell style
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+            ('LEFTPADDING', (0, 0), (-1, -1), 2),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 2),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('ROWBACKGROUNDS', (0, 0), (-1, 0), [colors.grey]),
+            ('WORDWRAP', (0, 0), (-1, -1), True)
+        )
+        # Legend rows and style never vary between reports, so both are
+        # built here; the per-call work is one Table construction
+        self._legend_data = [
+            ['Status', 'Color'],
+            ['Closed Request', ''],
+            ['Pending with Presales', ''],
+            ['Pending review', ''],
+            ['Pending approval', ''],
+            ['In Progress', ''],
+            ['Overdue (Duration)', '']
+        ]
+        self._legend_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            # Status colors
+            ('BACKGROUND', (1, 1), (1, 1), _STATUS_REPORTLAB['Closed Request']),
+            ('BACKGROUND', (1, 2), (1, 2), _STATUS_REPORTLAB['Pending with Presales']),
+            ('BACKGROUND', (1, 3), (1, 3), _STATUS_REPORTLAB['Pending review']),
+            ('BACKGROUND', (1, 4), (1, 4), _STATUS_REPORTLAB['Pending approval']),
+            ('BACKGROUND', (1, 5), (1, 5), _STATUS_REPORTLAB['in_progress']),
+            ('BACKGROUND', (1, 6), (1, 6), colors.Color(254/255, 202/255, 202/255))  # red-200 for overdue
+        ])
+        self._metrics_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+
+    def create_report_pdf(self, report_data: Dict, report_type: str, period: str, stream=None) -> io.BytesIO:
+        """Create PDF report with color coding, writing into the given stream"""
+        buffer = stream if stream is not None else io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=landscape(A4), topMargin=0.5*inch, leftMargin=0.5*inch, rightMargin=0.5*inch)
+        story = []
+
         # Company header
-        story.append(Paragraph("GBB Solution Design Team", header_style))
+        story.append(Paragraph("GBB Solution Design Team", self.header_style))
         
         # Title with date
         title = f"{report_type.title()} Report - {period}"
         story.append(Paragraph(title, self.title_style))
         story.append(Spacer(1, 20))
         
+        # One lookup for the request list; every section below keys off it
+        requests = report_data.get('requests') or ()
+
+        # Single pass over the requests: tally statuses, build the table
+        # rows and collect the per-row background styles together instead
+        # of re-walking the list for each
+        status_counts = Counter()
+        table_rows = None
+        row_colors = []
+        if requests:
+            table_rows = []
+
+            cell_style = self.table_cell_style
+            for index, req in enumerate(requests, 1):
+                status = req.get('status', 'Unknown')
+                status_counts[status] += 1
+
+                # Paragraph objects only where text can wrap; short
+                # columns go through ReportLab's plain-string fast path
+                table_rows.append([
+                    str(value) if col in _SHORT_COLUMNS
+                    else Paragraph(str(value), cell_style)
+                    for col, value in enumerate(_prepare_row(req, index))
+                ])
+
+                # Row background plus whether the duration cell needs the
+                # overdue highlight; indices are assigned per chunk below
+                row_colors.append((self.get_status_color(status, 'reportlab'),
+                                   self.is_overdue(req)))
+
         # Summary metrics with detailed status breakdown
         metrics_data = [
             ['Metric', 'Count'],
@@ -130,14 +252,8 @@ class PDFExporter(ReportExporter):
             ['In Progress', str(report_data.get('in_progress', 0))],
             ['Overdue', str(report_data.get('overdue', 0))]
         ]
-        
-        # Calculate status breakdown from requests data
-        if 'requests' in report_data and report_data['requests']:
-            status_counts = {}
-            for req in report_data['requests']:
-                status = req.get('status', 'Unknown')
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
+
+        if table_rows is not None:
             metrics_data.extend([
                 ['', ''],  # Empty row separator
                 ['Status Breakdown', ''],
@@ -147,96 +263,36 @@ class PDFExporter(ReportExporter):
                 ['Pending Approval', str(status_counts.get('Pending approval', 0))],
                 ['Closed Requests', str(status_counts.get('Closed Request', 0))]
             ])
-        
+
         metrics_table = Table(metrics_data, colWidths=[2*inch, 1*inch])
-        metrics_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        metrics_table.setStyle(self._metrics_table_style)
         
         story.append(Paragraph("Summary Metrics", self.styles['Heading2']))
         story.append(metrics_table)
         story.append(Spacer(1, 20))
         
-        # Requests table
-        if 'requests' in report_data and report_data['requests']:
+        # Requests table as a LongTable: unlike Table, whose page-break
+        # split recomputes row heights across the whole body, LongTable
+        # lays out incrementally and splits in O(rows on page)
+        if table_rows is not None:
             story.append(Paragraph("Request Details", self.styles['Heading2']))
-            
-            # Table headers with specified column order - wrapped as Paragraphs for proper text wrapping
-            headers = [
-                Paragraph('S/N', self.table_header_style),
-                Paragraph('Customer', self.table_header_style),
-                Paragraph('Description', self.table_header_style),
-                Paragraph('BOQ-Cost (NGN)', self.table_header_style),
-                Paragraph('BM (Name)', self.table_header_style),
-                Paragraph('Date Request Received', self.table_header_style),
-                Paragraph('Target (working days)', self.table_header_style),
-                Paragraph('Date Sent Out (Date sent to BD/RDIS/EBG)', self.table_header_style),
-                Paragraph('Duration (Working days)', self.table_header_style),
-                Paragraph('Team Member Involved', self.table_header_style),
-                Paragraph('Comment', self.table_header_style)
-            ]
-            table_data = [headers]
-            
-            # Table rows with color coding
-            for index, req in enumerate(report_data['requests'], 1):
-                comment = req.get('comment', '') or ''
-                boq_cost = f"NGN {req.get('boq_cost', 0):,.2f}" if req.get('boq_cost') else 'N/A'
-                sent_out_date = req.get('sent_out_date', '') if req.get('sent_out_date') else 'N/A'
-                
-                # Create Paragraph objects for text wrapping
-                row = [
-                    Paragraph(str(index), self.table_cell_style),  # Sequential numbering
-                    Paragraph(req.get('customer_name', ''), self.table_cell_style),
-                    Paragraph(req.get('description', ''), self.table_cell_style),
-                    Paragraph(boq_cost, self.table_cell_style),
-                    Paragraph(req.get('requester_name', ''), self.table_cell_style),
-                    Paragraph(req.get('date_request_received', ''), self.table_cell_style),
-                    Paragraph(f"{req.get('target_days', 'N/A')}" if req.get('target_days') else 'N/A', self.table_cell_style),
-                    Paragraph(sent_out_date, self.table_cell_style),
-                    Paragraph(f"{req.get('duration_days', 0)}", self.table_cell_style),
-                    Paragraph(req.get('team_member_involved', ''), self.table_cell_style),
-                    Paragraph(comment, self.table_cell_style)
-                ]
-                table_data.append(row)
-            
-            requests_table = Table(table_data, colWidths=[0.3*inch, 0.8*inch, 1.0*inch, 0.7*inch, 0.8*inch, 
-                                                         0.8*inch, 0.5*inch, 0.8*inch, 0.5*inch, 0.8*inch, 0.9*inch], 
-                                  repeatRows=1)
-            
-            # Base table style
-            table_style = [
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 7),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                ('LEFTPADDING', (0, 0), (-1, -1), 2),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 2),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ROWBACKGROUNDS', (0, 0), (-1, 0), [colors.grey]),
-                ('WORDWRAP', (0, 0), (-1, -1), True)
-            ]
-            
-            # Add color coding for each row
-            for i, req in enumerate(report_data['requests'], 1):
-                status_color = self.get_status_color(req.get('status', ''), 'reportlab')
-                table_style.append(('BACKGROUND', (0, i), (-1, i), status_color))
-                
+
+            col_widths = [0.3*inch, 0.8*inch, 1.0*inch, 0.7*inch, 0.8*inch,
+                          0.8*inch, 0.5*inch, 0.8*inch, 0.5*inch, 0.8*inch, 0.9*inch]
+
+            table_style = list(self._base_table_style_ops)
+            for row_idx, (status_color, overdue) in enumerate(row_colors, 1):
+                table_style.append(('BACKGROUND', (0, row_idx), (-1, row_idx), status_color))
                 # Red background for overdue requests - only duration cell (column 8)
-                if self.is_overdue(req):
-                    table_style.append(('BACKGROUND', (8, i), (8, i), colors.Color(254/255, 202/255, 202/255)))  # red-200
-            
+                if overdue:
+                    table_style.append(('BACKGROUND', (8, row_idx), (8, row_idx),
+                                        colors.Color(254/255, 202/255, 202/255)))  # red-200
+
+            header_row = [Paragraph(title, self.table_header_style)
+                          for title in self._header_titles]
+            requests_table = LongTable([header_row] + table_rows,
+                                       colWidths=col_widths, repeatRows=1,
+                                       splitByRow=True)
             requests_table.setStyle(TableStyle(table_style))
             story.append(requests_table)
             
@@ -244,37 +300,8 @@ class PDFExporter(ReportExporter):
             story.append(Spacer(1, 20))
             story.append(Paragraph("Color Guide", self.styles['Heading2']))
             
-            legend_data = [
-                ['Status', 'Color'],
-                ['Closed Request', ''],
-                ['Pending with Presales', ''],
-                ['Pending review', ''],
-                ['Pending approval', ''],
-                ['In Progress', ''],
-                ['Overdue (Duration)', '']
-            ]
-            
-            legend_table = Table(legend_data, colWidths=[2*inch, 1*inch])
-            
-            legend_style = [
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                # Status colors
-                ('BACKGROUND', (1, 1), (1, 1), self.get_status_color('Closed Request', 'reportlab')),
-                ('BACKGROUND', (1, 2), (1, 2), self.get_status_color('Pending with Presales', 'reportlab')),
-                ('BACKGROUND', (1, 3), (1, 3), self.get_status_color('Pending review', 'reportlab')),
-                ('BACKGROUND', (1, 4), (1, 4), self.get_status_color('Pending approval', 'reportlab')),
-                ('BACKGROUND', (1, 5), (1, 5), self.get_status_color('in_progress', 'reportlab')),
-                ('BACKGROUND', (1, 6), (1, 6), colors.Color(254/255, 202/255, 202/255))  # red-200 for overdue
-            ]
-            
-            legend_table.setStyle(TableStyle(legend_style))
+            legend_table = Table(self._legend_data, colWidths=[2*inch, 1*inch])
+            legend_table.setStyle(self._legend_style)
             story.append(legend_table)
         
         
@@ -286,71 +313,96 @@ class PDFExporter(ReportExporter):
 
 class ExcelExporter(ReportExporter):
     """Excel export functionality"""
-    
-    def create_report_excel(self, report_data: Dict, report_type: str, period: str) -> io.BytesIO:
-        """Create Excel report with color coding"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = f"{report_type.title()} Report"
-        
-        # Styles
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        center_alignment = Alignment(horizontal="center", vertical="center")
-        border = Border(
+
+    def __init__(self):
+        # Immutable style objects, built once per process like the
+        # PDFExporter styles
+        self.header_font = Font(bold=True, color="FFFFFF")
+        self.header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        self.bold_font = Font(bold=True)
+        self.border = Border(
             left=Side(style='thin'),
             right=Side(style='thin'),
             top=Side(style='thin'),
             bottom=Side(style='thin')
         )
-        
+
+    def create_report_excel(self, report_data: Dict, report_type: str, period: str, stream=None) -> io.BytesIO:
+        """Create Excel report with color coding, writing into the given stream"""
+        # write_only streams rows into the archive as they are appended
+        # instead of building the whole in-memory cell graph. Write-only
+        # sheets cannot merge cells (titles become plain single-cell rows
+        # with the same fonts) and cannot be revisited, so the rows are
+        # buffered below and the column widths set before the first append.
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title=f"{report_type.title()} Report")
+
+        # One lookup for the request list; every section below keys off it
+        requests = report_data.get('requests') or ()
+
+        header_font = self.header_font
+        header_fill = self.header_fill
+        bold_font = self.bold_font
+        border = self.border
+
+        def cell(value, font=None, fill=None, alignment=None, boxed=False):
+            c = WriteOnlyCell(ws, value=value)
+            if font is not None:
+                c.font = font
+            if fill is not None:
+                c.fill = fill
+            if alignment is not None:
+                c.alignment = alignment
+            if boxed:
+                c.border = border
+            return c
+
+        pending_rows = []
+        col_widths = [0] * 11
+
+        def add_row(row_cells):
+            # Track the running width maximum as rows are built, so no
+            # second pass over the buffered rows is needed at the end
+            for col, c in enumerate(row_cells):
+                if c.value:
+                    length = len(str(c.value))
+                    if length > col_widths[col]:
+                        col_widths[col] = length
+            pending_rows.append(row_cells)
+
         # Header with team info
-        ws.merge_cells('A1:N1')
-        ws['A1'] = "GBB Solution Design Team"
-        ws['A1'].font = Font(bold=True, size=18, color="366092")
-        ws['A1'].alignment = center_alignment
-        
+        add_row([cell("GBB Solution Design Team",
+                                  font=Font(bold=True, size=18, color="366092"),
+                                  alignment=_CENTER_ALIGN)])
+
         # Title with date
-        ws.merge_cells('A2:N2')
-        ws['A2'] = f"{report_type.title()} Report - {period}"
-        ws['A2'].font = Font(bold=True, size=16)
-        ws['A2'].alignment = center_alignment
-        
+        add_row([cell(f"{report_type.title()} Report - {period}",
+                                  font=Font(bold=True, size=16),
+                                  alignment=_CENTER_ALIGN)])
+
         # Summary metrics
-        row = 4
-        ws[f'A{row}'] = "Summary Metrics"
-        ws[f'A{row}'].font = Font(bold=True, size=14)
-        
-        row += 1
+        pending_rows.append([])
+        add_row([cell("Summary Metrics", font=Font(bold=True, size=14))])
+
         metrics = [
             ('Created', report_data.get('created', 0)),
             ('Completed', report_data.get('completed', 0)),
             ('In Progress', report_data.get('in_progress', 0)),
             ('Overdue', report_data.get('overdue', 0))
         ]
-        
+
         for metric, value in metrics:
-            ws[f'A{row}'] = metric
-            ws[f'B{row}'] = value
-            ws[f'A{row}'].font = Font(bold=True)
-            ws[f'A{row}'].border = border
-            ws[f'B{row}'].border = border
-            row += 1
-        
+            add_row([cell(metric, font=bold_font, boxed=True),
+                                 cell(value, boxed=True)])
+
         # Calculate status breakdown from requests data
-        if 'requests' in report_data and report_data['requests']:
-            status_counts = {}
-            for req in report_data['requests']:
-                status = req.get('status', 'Unknown')
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
-            row += 1  # Empty row separator
-            
-            # Status breakdown header
-            ws[f'A{row}'] = "Status Breakdown"
-            ws[f'A{row}'].font = Font(bold=True, size=12)
-            row += 1
-            
+        if requests:
+            status_counts = Counter(req.get('status', 'Unknown') for req in requests)
+
+            pending_rows.append([])  # Empty row separator
+
+            add_row([cell("Status Breakdown", font=Font(bold=True, size=12))])
+
             status_metrics = [
                 ('In Progress', status_counts.get('in_progress', 0)),
                 ('Pending with Presales', status_counts.get('Pending with Presales', 0)),
@@ -358,85 +410,57 @@ class ExcelExporter(ReportExporter):
                 ('Pending Approval', status_counts.get('Pending approval', 0)),
                 ('Closed Requests', status_counts.get('Closed Request', 0))
             ]
-            
+
             for metric, value in status_metrics:
-                ws[f'A{row}'] = metric
-                ws[f'B{row}'] = value
-                ws[f'A{row}'].font = Font(bold=True)
-                ws[f'A{row}'].border = border
-                ws[f'B{row}'].border = border
-                row += 1
-        
+                add_row([cell(metric, font=bold_font, boxed=True),
+                                     cell(value, boxed=True)])
+
         # Requests section
-        if 'requests' in report_data and report_data['requests']:
-            row += 2
-            ws[f'A{row}'] = "Request Details"
-            ws[f'A{row}'].font = Font(bold=True, size=14)
-            
-            row += 1
-            headers = ['S/N', 'Customer', 'Description', 'BOQ-Cost', 'BM (Name)', 
-                      'Date Request Received', 'Target (working days)', 
+        if requests:
+            pending_rows.append([])
+            pending_rows.append([])
+            add_row([cell("Request Details", font=Font(bold=True, size=14))])
+
+            headers = ['S/N', 'Customer', 'Description', 'BOQ-Cost', 'BM (Name)',
+                      'Date Request Received', 'Target (working days)',
                       'Date Sent Out (Date sent to BD/RDIS/EBG)', 'Duration (Working days)', 'Team Member Involved', 'Comment']
-            
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=row, column=col, value=header)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = center_alignment
-                cell.border = border
-            
+
+            add_row([cell(header, font=header_font, fill=header_fill,
+                                      alignment=_CENTER_ALIGN, boxed=True)
+                                 for header in headers])
+
             # Data rows with color coding
-            for index, req in enumerate(report_data['requests'], 1):
-                row += 1
-                comment = req.get('comment', '') or ''
-                boq_cost = f"NGN {req.get('boq_cost', 0):,.2f}" if req.get('boq_cost') else 'N/A'
-                sent_out_date = req.get('sent_out_date', '') if req.get('sent_out_date') else 'N/A'
-                
-                data = [
-                    index,  # Sequential numbering
-                    req.get('customer_name', ''),
-                    req.get('description', ''),
-                    boq_cost,
-                    req.get('requester_name', ''),
-                    req.get('date_request_received', ''),
-                    req.get('target_days', '') if req.get('target_days') else 'N/A',
-                    sent_out_date,
-                    req.get('duration_days', 0),
-                    req.get('team_member_involved', ''),
-                    comment
-                ]
-                
+            for index, req in enumerate(requests, 1):
+                data = _prepare_row(req, index)
+
+                # Status color coding
+                status_fill = _STATUS_FILLS.get(req.get('status', ''))
+                overdue = self.is_overdue(req)
+
+                row_cells = []
                 for col, value in enumerate(data, 1):
-                    cell = ws.cell(row=row, column=col, value=value)
-                    cell.border = border
-                    cell.alignment = center_alignment if col in [1, 7, 9] else Alignment(horizontal="left", vertical="center")
-                    
-                    # Status color coding
-                    status = req.get('status', '')
-                    if status:
-                        hex_color = self.get_status_color(status, 'hex').replace('#', '')
-                        cell.fill = PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid")
-                    
+                    fill = status_fill
                     # Overdue highlighting (red background) - only for duration column (column 9)
-                    if self.is_overdue(req) and col == 9:
-                        cell.fill = PatternFill(start_color="FECACA", end_color="FECACA", fill_type="solid")  # red-200
-        
+                    if overdue and col == 9:
+                        fill = _OVERDUE_FILL
+                    row_cells.append(cell(
+                        value,
+                        fill=fill,
+                        alignment=_CENTER_ALIGN if col in [1, 7, 9] else _LEFT_ALIGN,
+                        boxed=True
+                    ))
+                add_row(row_cells)
+
         # Color guide section
-        if 'requests' in report_data and report_data['requests']:
-            row += 3
-            ws[f'A{row}'] = "Color Guide"
-            ws[f'A{row}'].font = Font(bold=True, size=14)
-            
-            row += 1
-            legend_headers = ['Status', 'Color']
-            
-            for col, header in enumerate(legend_headers, 1):
-                cell = ws.cell(row=row, column=col, value=header)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = center_alignment
-                cell.border = border
-            
+        if requests:
+            pending_rows.append([])
+            pending_rows.append([])
+            add_row([cell("Color Guide", font=Font(bold=True, size=14))])
+
+            add_row([cell(header, font=header_font, fill=header_fill,
+                                      alignment=_CENTER_ALIGN, boxed=True)
+                                 for header in ['Status', 'Color']])
+
             # Legend data
             legend_items = [
                 ('Closed Request', 'Closed Request'),
@@ -446,36 +470,30 @@ class ExcelExporter(ReportExporter):
                 ('In Progress', 'in_progress'),
                 ('Overdue (Duration)', 'overdue')
             ]
-            
+
             for status_label, status_key in legend_items:
-                row += 1
-                # Status label
-                cell = ws.cell(row=row, column=1, value=status_label)
-                cell.border = border
-                cell.alignment = Alignment(horizontal="left", vertical="center")
-                
-                # Color cell
-                cell = ws.cell(row=row, column=2, value="")
-                cell.border = border
-                if status_key == 'overdue':
-                    cell.fill = PatternFill(start_color="FECACA", end_color="FECACA", fill_type="solid")  # red-200
-                else:
-                    hex_color = self.get_status_color(status_key, 'hex').replace('#', '')
-                    cell.fill = PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid")
-        
-        
-        # Auto-adjust column widths
-        for col in range(1, 12):
-            column_letter = get_column_letter(col)
-            max_length = 0
-            for row_cells in ws[f'{column_letter}1:{column_letter}{ws.max_row}']:
-                for cell in row_cells:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-            ws.column_dimensions[column_letter].width = min(max_length + 2, 30)
-        
+                legend_fill = _OVERDUE_FILL if status_key == 'overdue' else _STATUS_FILLS[status_key]
+                add_row([
+                    cell(status_label, alignment=_LEFT_ALIGN, boxed=True),
+                    cell("", fill=legend_fill, boxed=True)
+                ])
+
+        # Auto-adjust column widths; on a write-only sheet these must be
+        # set before the first row is appended
+        for col, max_length in enumerate(col_widths, 1):
+            ws.column_dimensions[get_column_letter(col)].width = min(max_length + 2, 30)
+
+        for row_cells in pending_rows:
+            ws.append(row_cells)
+
         # Save to buffer
-        buffer = io.BytesIO()
+        buffer = stream if stream is not None else io.BytesIO()
         wb.save(buffer)
         buffer.seek(0)
-        return buffer
\ No newline at end of file
+        return buffer
+
+
+# Exporters are stateless per call; share one instance per process so the
+# style objects in __init__ are built once
+PDF_EXPORTER = PDFExporter()
+EXCEL_EXPORTER = ExcelExporter()
@@ -0,0 +1,16 @@
+"""
+WSGI entrypoint for production serving.
+
+Run with:
+    gunicorn -k gevent -w $(nproc) --worker-connections 1000 wsgi:app
+
+monkey.patch_all() must run before the app (and anything it imports) so
+socket and file I/O become cooperative under the gevent worker.
+"""
+from gevent import monkey
+monkey.patch_all()
+
+from app import app  # noqa: E402
+
+if __name__ == "__main__":
+    app.run()